@@ -0,0 +1,119 @@
+from __future__ import unicode_literals
+
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.encoding import force_bytes
+
+from backbone.utils import get_affected_models, get_model_label
+
+try:
+    # Django versions >= 1.11
+    from django.core.exceptions import EmptyResultSet
+except ImportError:
+    # Django versions < 1.11
+    from django.db.models.sql.datastructures import EmptyResultSet
+
+
+# Cached data is invalidated by changing the "generation" of the models it depends on:
+# each model has a generation token stored in the cache, and the tokens of all the models
+# a cached value depends on are part of its cache key. Saving or deleting an object of a
+# tracked model replaces the model's token, which orphans the stale keys. Inside a transaction
+# the token is replaced again on commit, since a concurrent request could otherwise cache the
+# rows it still sees (the ones before the change) under the new token.
+
+_tracked_models = set()
+
+
+def get_model_key(model):
+    return 'backbone:generation:%s' % get_model_label(model)
+
+
+def track_generations(model):
+    """
+    Starts invalidating the cached data of the given model whenever its objects are changed.
+    """
+    _tracked_models.update(get_affected_models(model))
+
+
+def get_generations(models):
+    """
+    Returns the list of the current generation tokens of the given models.
+    """
+    keys = [get_model_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generations[key] = uuid.uuid4().hex
+            # Another process could have set the token in the meantime, in which case
+            # `add` does nothing and its token has to be used.
+            if not cache.add(key, generations[key], None):
+                generations[key] = cache.get(key, generations[key])
+    return [generations[key] for key in keys]
+
+
+def invalidate_model(model, using=None):
+    """
+    Invalidates all the cached data that depends on the given model, now and (if the given
+    database is in a transaction) when the transaction is committed.
+    """
+    def invalidate():
+        cache.set_many(dict(
+            (get_model_key(affected), uuid.uuid4().hex) for affected in get_affected_models(model)
+        ), None)
+
+    invalidate()
+    # Django versions >= 1.9
+    if hasattr(transaction, 'on_commit') and transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(invalidate, using=using)
+
+
+def get_version(models):
+    """
+    Returns a string identifying the current state of the given models (and their parents),
+    to be used in the cache keys of data that depends on them.
+
+    The models are tracked, so the version changes whenever one of their objects is changed.
+    """
+    affected = []
+    for model in models:
+        track_generations(model)
+        affected.extend(m for m in get_affected_models(model) if m not in affected)
+    return ':'.join(get_generations(affected))
+
+
+def get_cached_count(qs, timeout):
+    """
+    Returns the count of the given queryset, cached for the given number of seconds
+    (or until an object of the queryset's model is changed).
+    """
+    try:
+        sql, params = qs.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    digest = hashlib.md5(force_bytes('%s:%s:%r' % (qs.db, sql, params))).hexdigest()
+    key = 'backbone:count:%s:%s' % (digest, get_version([qs.model]))
+    count = cache.get(key)
+    if count is None:
+        count = qs.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+def _model_changed(sender, using=None, **kwargs):
+    if any(model in _tracked_models for model in get_affected_models(sender)):
+        invalidate_model(sender, using)
+
+
+def _m2m_changed(sender, instance, model, action, using=None, **kwargs):
+    if action.startswith('post_'):
+        _model_changed(type(instance), using)
+        _model_changed(model, using)
+
+
+post_save.connect(_model_changed, dispatch_uid='backbone.cache.post_save')
+post_delete.connect(_model_changed, dispatch_uid='backbone.cache.post_delete')
+m2m_changed.connect(_m2m_changed, dispatch_uid='backbone.cache.m2m_changed')
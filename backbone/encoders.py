@@ -0,0 +1,110 @@
+from __future__ import unicode_literals
+
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import six
+
+
+class JSONBackend(object):
+    """
+    Encodes data to JSON using the standard library's `json` module.
+
+    All backends hand the types JSON doesn't support (dates and times, decimals, UUIDs, lazy
+    translation strings, ...) to `DjangoJSONEncoder`, and write non-ASCII characters as is (like
+    orjson, which can't escape them), so their output is the same.
+    """
+    name = 'json'
+
+    def dumps(self, data, sort_keys=False, indent=None, separators=None, **options):
+        if separators is None:
+            separators = (',', ': ') if indent else (',', ':')
+        options.setdefault('ensure_ascii', False)
+        return json.dumps(
+            data, cls=DjangoJSONEncoder, sort_keys=sort_keys, indent=indent, separators=separators, **options
+        )
+
+
+class SimpleJSONBackend(JSONBackend):
+    """
+    Encodes data to JSON using `simplejson` (and its C speedups).
+    """
+    name = 'simplejson'
+
+    def __init__(self):
+        import simplejson
+        self.simplejson = simplejson
+        self.default = DjangoJSONEncoder().default
+
+    def dumps(self, data, sort_keys=False, indent=None, separators=None, **options):
+        if separators is None:
+            separators = (',', ': ') if indent else (',', ':')
+        # Let DjangoJSONEncoder represent Decimal instances as JS strings (ticket #16850)
+        options.setdefault('use_decimal', False)
+        options.setdefault('ensure_ascii', False)
+        return self.simplejson.dumps(
+            data, default=self.default, sort_keys=sort_keys, indent=indent, separators=separators, **options
+        )
+
+
+class OrJSONBackend(JSONBackend):
+    """
+    Encodes data to JSON using `orjson`.
+
+    orjson only supports indenting by two spaces and ignores `separators`.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+        self.encoder = DjangoJSONEncoder()
+
+    def default(self, o):
+        # orjson serializes subclasses of builtin types from their internal storage, which is
+        # wrong for e.g. Django's ErrorList (a UserList whose items live in `.data`), so they are
+        # passed through and converted here.
+        if isinstance(o, dict):
+            return dict(o)
+        if isinstance(o, (list, tuple)):
+            return list(o)
+        if isinstance(o, six.text_type):
+            return six.text_type(o)
+        if isinstance(o, bool):
+            return bool(o)
+        if isinstance(o, six.integer_types):
+            return int(o)
+        if isinstance(o, float):
+            return float(o)
+        return self.encoder.default(o)
+
+    def dumps(self, data, sort_keys=False, indent=None, separators=None, **options):
+        # Dates and times are formatted by DjangoJSONEncoder rather than natively
+        option = self.orjson.OPT_PASSTHROUGH_DATETIME | self.orjson.OPT_PASSTHROUGH_SUBCLASS
+        if sort_keys:
+            option |= self.orjson.OPT_SORT_KEYS
+        if indent:
+            option |= self.orjson.OPT_INDENT_2
+        return self.orjson.dumps(data, default=self.default, option=option).decode('utf-8')
+
+
+BACKENDS = dict((backend.name, backend) for backend in (JSONBackend, SimpleJSONBackend, OrJSONBackend))
+
+_backends = {}
+
+
+def get_json_backend(name=None):
+    """
+    Returns the JSON backend with the given name (one of `BACKENDS`).
+
+    Falls back to the standard library's `json` if the backend's library is not installed.
+    """
+    if name not in _backends:
+        if (name or 'json') not in BACKENDS:
+            raise ImproperlyConfigured('Unknown JSON backend: %s' % name)
+        try:
+            _backends[name] = BACKENDS[name or 'json']()
+        except ImportError:
+            _backends[name] = JSONBackend()
+    return _backends[name]
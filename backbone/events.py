@@ -0,0 +1,111 @@
+from __future__ import unicode_literals
+
+from collections import defaultdict
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.module_loading import import_string
+from django.utils.six.moves import queue
+
+from backbone.utils import get_affected_models, get_model_label
+
+
+# Change feeds stream the changes of the models of their views as they happen. The changes are
+# published (once their transaction is committed) by the signal receivers below to a broker,
+# which delivers them to the queue of every subscribed feed.
+
+_tracked_models = set()
+
+
+class LocalBroker(object):
+    """
+    Delivers messages between the threads of the current process.
+
+    Another broker (e.g. backed by a pub/sub service, to deliver messages between processes)
+    can be used with the ``BACKBONE_EVENT_BROKER`` setting; it only needs the same methods.
+    """
+
+    def __init__(self):
+        self.subscribers = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """
+        Returns a new queue which receives the messages published to the given channel.
+        """
+        subscriber = queue.Queue()
+        with self.lock:
+            self.subscribers[channel].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self.lock:
+            self.subscribers[channel].discard(subscriber)
+
+    def publish(self, channel, message):
+        with self.lock:
+            subscribers = list(self.subscribers[channel])
+        for subscriber in subscribers:
+            subscriber.put(message)
+
+
+_broker = None
+
+
+def get_broker():
+    """
+    Returns the broker set with the ``BACKBONE_EVENT_BROKER`` setting (a class path),
+    which defaults to `LocalBroker`.
+    """
+    global _broker
+    if _broker is None:
+        path = getattr(settings, 'BACKBONE_EVENT_BROKER', None)
+        _broker = import_string(path)() if path else LocalBroker()
+    return _broker
+
+
+def get_channel(model):
+    return 'backbone:events:%s' % get_model_label(model)
+
+
+def track_events(model):
+    """
+    Starts publishing the changes of the objects of the given model.
+    """
+    _tracked_models.add(model._meta.concrete_model)
+
+
+def publish(model, event, pk):
+    """
+    Publishes the given event (``created``, ``updated`` or ``deleted``) of the object with the
+    given pk to the feeds of the model (and its parents), once the transaction is committed.
+    """
+    channels = [get_channel(affected) for affected in get_affected_models(model) if affected in _tracked_models]
+    if not channels:
+        return
+
+    def send():
+        broker = get_broker()
+        for channel in channels:
+            broker.publish(channel, {'event': event, 'pk': pk})
+
+    if hasattr(transaction, 'on_commit'):
+        # Django versions >= 1.9
+        transaction.on_commit(send)
+    else:
+        send()
+
+
+def _model_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        publish(sender, 'created' if created else 'updated', instance.pk)
+
+
+def _model_deleted(sender, instance, **kwargs):
+    publish(sender, 'deleted', instance.pk)
+
+
+post_save.connect(_model_saved, dispatch_uid='backbone.events.post_save')
+post_delete.connect(_model_deleted, dispatch_uid='backbone.events.post_delete')
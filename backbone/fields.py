@@ -0,0 +1,584 @@
+from __future__ import unicode_literals
+
+from django.db.models import DateField, F, Field, Manager, Model, Q, TimeField
+from django.utils.encoding import is_protected_type, smart_text
+
+try:
+    # Django versions >= 1.8
+    from django.core.exceptions import FieldDoesNotExist
+except ImportError:
+    # Django versions < 1.8
+    from django.db.models.fields import FieldDoesNotExist
+
+
+class InvalidFields(Exception):
+    pass
+
+
+class IncludedField(object):
+    """
+    A display field for a relation (foreign key or many-to-many) whose related objects are
+    included in the serialized data, serialized by the given view with the given fields.
+    """
+
+    def __init__(self, name, view, fields):
+        self.name = name
+        self.view = view
+        self.fields = tuple(fields)
+
+    def __eq__(self, other):
+        return isinstance(other, IncludedField) and self._key() == other._key()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        return (self.name, type(self.view), self.fields)
+
+
+class DisplayFieldHints(object):
+    """
+    What a callable display field reads from the objects (see `display_field`): the columns
+    (`only`, or None if they aren't known), and the relations to load with `select_related`
+    and `prefetch_related`.
+    """
+
+    def __init__(self, only=None, select_related=(), prefetch_related=()):
+        self.only = None if only is None else tuple(only)
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+
+def display_field(only=None, select_related=(), prefetch_related=()):
+    """
+    Decorates a callable display field (a function, or a method or property of the view or
+    model) with the columns and relations it reads, so that they are loaded in bulk for
+    collections. When `only` is given (even empty), no other columns are loaded for it. E.g.::
+
+        @display_field(only=['name'], select_related=['brand'])
+        def title(self, obj):
+            return '%s (%s)' % (obj.name, obj.brand.name)
+    """
+    hints = DisplayFieldHints(only, select_related, prefetch_related)
+
+    def decorator(func):
+        # Properties can't have attributes, but their getter can
+        getattr(func, 'fget', func).display_field_hints = hints
+        return func
+    return decorator
+
+
+class FieldAccessor(object):
+    """
+    Reads the value of a single display field from a model instance.
+
+    Accessors are built once per view class (see `compile_field_plan`) so that
+    no field resolution takes place while serializing objects.
+    """
+    kind = None
+    values_name = None  # The name to pass to `QuerySet.values()`, if the value can be read that way.
+    values_converter = None  # Function applied to values read from `QuerySet.values()`.
+    hints = None  # What a callable field reads (see `display_field`).
+    related_models = ()  # The models of the relations the field reads, besides its own relation.
+
+    def __init__(self, name, key=None):
+        self.name = name
+        self.key = key or name
+
+    def __call__(self, view, obj):
+        raise NotImplementedError
+
+
+class ColumnAccessor(FieldAccessor):
+    """
+    A concrete model field. Values are converted the same way as Django's python serializer.
+    """
+    kind = 'column'
+
+    def __init__(self, name, field):
+        super(ColumnAccessor, self).__init__(name)
+        self.field = field
+        self.attname = field.attname
+        if isinstance(field, (DateField, TimeField)):
+            # Dates and times are always protected types (or None).
+            self.values_name = name
+        elif _func(type(field).value_to_string) is _func(Field.value_to_string):
+            self.values_name = name
+            self.values_converter = _to_text
+
+    def __call__(self, view, obj):
+        value = getattr(obj, self.attname)
+        if is_protected_type(value):
+            return value
+        return self.field.value_to_string(obj)
+
+
+class PrimaryKeyAccessor(FieldAccessor):
+    """
+    A field that is not handled by Django's serializer (e.g. the primary key) and is returned as is.
+    """
+    kind = 'pk'
+
+    def __init__(self, name, field):
+        super(PrimaryKeyAccessor, self).__init__(name)
+        self.field = field
+        self.attname = field.attname
+        self.values_name = name
+
+    def __call__(self, view, obj):
+        return getattr(obj, self.attname)
+
+
+class ForeignKeyAccessor(FieldAccessor):
+    """
+    A foreign key (or one-to-one) field, returned as the primary key of the related object.
+
+    When the relation points at the primary key of the related model, the value is read from
+    the local ``<name>_id`` column so the related object is never loaded.
+    """
+    kind = 'fk'
+
+    def __init__(self, name, field):
+        super(ForeignKeyAccessor, self).__init__(name)
+        self.field = field
+        self.attname = field.attname
+        self.targets_pk = all(f.primary_key for f in field.foreign_related_fields)
+        if self.targets_pk:
+            self.values_name = name
+
+    def __call__(self, view, obj):
+        if self.targets_pk:
+            return getattr(obj, self.attname)
+        related = getattr(obj, self.name)
+        if related is None:
+            return None
+        return related.pk
+
+
+class ManyToManyAccessor(FieldAccessor):
+    """
+    A many-to-many field, returned as a list of primary keys of the related objects.
+
+    If the relation has been prefetched, the primary keys are read from the prefetch cache.
+    """
+    kind = 'm2m'
+
+    def __init__(self, name, field):
+        super(ManyToManyAccessor, self).__init__(name)
+        self.field = field
+
+    def __call__(self, view, obj):
+        manager = getattr(obj, self.name)
+        if self.name in getattr(obj, '_prefetched_objects_cache', ()):
+            return [item.pk for item in manager.all()]
+        return list(manager.values_list('pk', flat=True))
+
+
+class IncludedAccessor(FieldAccessor):
+    """
+    A relation whose related objects are serialized by the view of the related model
+    (see `IncludedField`). The related objects are expected to be prefetched.
+    """
+    kind = 'include'
+
+    def __init__(self, name, field, view, fields):
+        super(IncludedAccessor, self).__init__(name)
+        self.field = field
+        self.view = view
+        self.fields = fields
+
+    def __call__(self, view, obj):
+        if self.field.many_to_many:
+            return [self.view.serialize(related, self.fields) for related in getattr(obj, self.name).all()]
+        related = getattr(obj, self.name)
+        if related is None:
+            return None
+        return self.view.serialize(related, self.fields)
+
+
+class AnnotationAccessor(FieldAccessor):
+    """
+    An ORM expression (see `BackboneAPIView.annotated_fields`), computed by the database with
+    `QuerySet.annotate()` and read from the annotated value.
+
+    The annotation is named after the field, unless the model has an attribute of the same
+    name (e.g. a property it replaces), which it would clash with.
+    """
+    kind = 'annotation'
+
+    def __init__(self, name, expression, model):
+        super(AnnotationAccessor, self).__init__(name)
+        self.expression = expression
+        self.annotation_name = 'backbone_%s' % name if hasattr(model, name) else name
+        self.values_name = self.annotation_name
+        self.related_models = _get_related_models(model, expression)
+
+    def __call__(self, view, obj):
+        return getattr(obj, self.annotation_name)
+
+
+class ViewMethodAccessor(FieldAccessor):
+    """
+    A method on the view which is given the object.
+    """
+    kind = 'view_method'
+
+    def __call__(self, view, obj):
+        return getattr(view, self.name)(obj)
+
+
+class CallableAccessor(FieldAccessor):
+    """
+    A callable (listed directly in the display fields) which is given the object.
+    """
+    kind = 'callable'
+
+    def __init__(self, func):
+        super(CallableAccessor, self).__init__(func.__name__)
+        self.func = func
+
+    def __call__(self, view, obj):
+        return self.func(obj)
+
+
+class ModelMethodAccessor(FieldAccessor):
+    """
+    A method on the model, called without arguments.
+    """
+    kind = 'model_method'
+
+    def __call__(self, view, obj):
+        return getattr(obj, self.name)()
+
+
+class AttributeAccessor(FieldAccessor):
+    """
+    A property (or any other attribute) on the model.
+
+    Since the type of the value is only known once it is read, related objects, managers
+    and callables are handled the same way as they are for the other accessors.
+    """
+    kind = 'property'
+
+    def __call__(self, view, obj):
+        try:
+            value = getattr(obj, self.name)
+        except AttributeError:
+            raise AttributeError('Invalid field: %s' % self.name)
+        if isinstance(value, Model):
+            return value.pk
+        elif isinstance(value, Manager):
+            return list(value.values_list('pk', flat=True))
+        elif callable(value):
+            return value()
+        return value
+
+
+class FieldPlan(object):
+    """
+    The compiled list of accessors used to serialize objects for a list of display fields.
+
+    `select_related` and `prefetch_related` list the relations that should be loaded in bulk
+    when serializing a queryset with this plan, and `related_models` the models of all the
+    relations used by the plan. `only_fields` lists the columns to load (if they are known), and
+    `annotations` the expressions to annotate the queryset with.
+    """
+
+    def __init__(self, accessors):
+        self.accessors = accessors
+        self.select_related = []
+        self.prefetch_related = []
+        self.related_models = []
+        self.annotations = {}
+        for accessor in accessors:
+            if accessor.kind == 'fk' and not accessor.targets_pk:
+                self.select_related.append(accessor.name)
+            elif accessor.kind == 'm2m':
+                self.prefetch_related.append(accessor.name)
+            if accessor.kind in ('fk', 'm2m', 'include') and accessor.field.related_model not in self.related_models:
+                self.related_models.append(accessor.field.related_model)
+            if accessor.kind == 'include':
+                related_plan = accessor.view.get_field_plan(accessor.fields)
+                self.related_models.extend(
+                    model for model in related_plan.related_models if model not in self.related_models
+                )
+            elif accessor.kind == 'annotation':
+                self.annotations[accessor.annotation_name] = accessor.expression
+            if accessor.hints is not None:
+                self.select_related.extend(
+                    name for name in accessor.hints.select_related if name not in self.select_related
+                )
+                self.prefetch_related.extend(
+                    lookup for lookup in accessor.hints.prefetch_related if lookup not in self.prefetch_related
+                )
+            self.related_models.extend(
+                model for model in accessor.related_models if model not in self.related_models
+            )
+
+        # Included relations are prefetched by the view already (see `prefetch_included`).
+        included = [accessor.name for accessor in accessors if accessor.kind == 'include']
+        self.prefetch_related = [lookup for lookup in self.prefetch_related if lookup not in included]
+
+        # When every field is a column (or relation), or a callable whose columns are known,
+        # the other columns don't need to be loaded.
+        if all(
+            accessor.kind in ('pk', 'column', 'fk', 'm2m', 'annotation') or
+            (accessor.hints is not None and accessor.hints.only is not None)
+            for accessor in accessors
+        ):
+            self.only_fields = []
+            for accessor in accessors:
+                if accessor.hints is not None:
+                    names = list(accessor.hints.only) + accessor.hints_relations
+                elif accessor.kind not in ('m2m', 'annotation'):
+                    names = [accessor.name]
+                else:
+                    names = []
+                self.only_fields.extend(name for name in names if name not in self.only_fields)
+        else:
+            self.only_fields = None
+
+        # When every field can be read with `QuerySet.values()`, no model instances are needed.
+        if all(accessor.values_name for accessor in accessors):
+            self.values_fields = [accessor.values_name for accessor in accessors]
+        else:
+            self.values_fields = None
+        self.values_converters = [
+            (accessor.key, accessor.values_converter) for accessor in accessors
+            if accessor.values_converter
+        ]
+        self.values_renames = [
+            (accessor.values_name, accessor.key) for accessor in accessors
+            if accessor.values_name and accessor.values_name != accessor.key
+        ]
+
+    def optimize_queryset(self, qs):
+        """
+        Returns the given queryset with the relations used by this plan loaded in bulk (and
+        its annotations computed).
+        """
+        qs = self.annotate_queryset(qs)
+        if self.select_related:
+            qs = qs.select_related(*self.select_related)
+        if self.prefetch_related:
+            qs = qs.prefetch_related(*self.prefetch_related)
+        return qs
+
+    def annotate_queryset(self, qs):
+        """
+        Returns the given queryset annotated with the expressions of this plan.
+        """
+        if self.annotations:
+            qs = qs.annotate(**self.annotations)
+        return qs
+
+    def serialize(self, view, obj):
+        data = {}
+        for accessor in self.accessors:
+            data[accessor.key] = accessor(view, obj)
+        return data
+
+    def serialize_values(self, qs):
+        """
+        Serializes the given queryset using `QuerySet.values()`, without creating model instances.
+
+        Only possible when `values_fields` is set.
+        """
+        return [self.convert_values(row) for row in self.values_queryset(qs)]
+
+    def values_queryset(self, qs, extra=()):
+        """
+        Returns the `values()` queryset that reads the fields of this plan (and any given
+        extra fields) from the given queryset.
+        """
+        names = self.values_fields + [name for name in extra if name not in self.values_fields]
+        return qs.prefetch_related(None).values(*names)
+
+    def convert_values(self, row):
+        """
+        Converts a row of the `values_queryset` to its serialized form (in place).
+        """
+        for values_name, key in self.values_renames:
+            row[key] = row.pop(values_name)
+        for key, converter in self.values_converters:
+            row[key] = converter(row[key])
+        return row
+
+
+def _func(method):
+    # Unbound methods (Python 2) wrap the underlying function.
+    return getattr(method, '__func__', method)
+
+
+def _to_text(value):
+    if is_protected_type(value):
+        return value
+    return smart_text(value)
+
+
+def _get_related_models(model, expression):
+    # The models the given expression reads from: those of the relations its field references
+    # go through (e.g. ``Min('categories__id')``), and those of its subqueries.
+    related_models = []
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        related = None
+        if isinstance(node, Q):
+            for child in node.children:
+                if isinstance(child, tuple):
+                    stack.extend([F(child[0]), child[1]])
+                else:
+                    stack.append(child)
+        elif isinstance(node, F):
+            try:
+                field = model._meta.get_field(node.name.split('__')[0])
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.is_relation:
+                related = field.related_model
+        elif hasattr(node, 'get_source_expressions'):
+            stack.extend(node.get_source_expressions())
+            if getattr(node, 'queryset', None) is not None:
+                related = node.queryset.model
+        if related is not None and related is not model and related not in related_models:
+            related_models.append(related)
+    return related_models
+
+
+def _get_path_models(model, path):
+    # The models of the relations the given lookup path (e.g. ``brand__country``) goes through.
+    models = []
+    for name in path.split('__'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        model = field.related_model
+        models.append(model)
+    return models
+
+
+def _set_hints(accessor, model, hints):
+    # Sets the given `DisplayFieldHints` on the accessor of a callable display field.
+    accessor.hints = hints
+    paths = [
+        getattr(lookup, 'prefetch_through', lookup) for lookup in hints.prefetch_related
+    ] + list(hints.select_related)
+    accessor.related_models = []
+    # The local columns of the relations have to be loaded too (when they are foreign keys)
+    accessor.hints_relations = []
+    for path in paths:
+        accessor.related_models.extend(
+            related for related in _get_path_models(model, path) if related not in accessor.related_models
+        )
+        try:
+            field = model._meta.get_field(path.split('__')[0])
+        except FieldDoesNotExist:
+            continue
+        if field.concrete and not field.many_to_many and field.name not in accessor.hints_relations:
+            accessor.hints_relations.append(field.name)
+
+
+def get_accessor(view_class, model, field):
+    """
+    Returns the accessor to be used for the given display field, with the hints of what it
+    reads if it is a callable (see `display_field` and `BackboneAPIView.display_field_hints`).
+    """
+    accessor = _get_accessor(view_class, model, field)
+    if accessor.kind in ('callable', 'view_method', 'model_method', 'property'):
+        hints = (getattr(view_class, 'display_field_hints', None) or {}).get(accessor.name)
+        if hints is not None:
+            hints = DisplayFieldHints(**hints)
+        else:
+            if accessor.kind == 'callable':
+                func = field
+            elif accessor.kind == 'view_method':
+                func = getattr(view_class, field)
+            else:
+                func = getattr(model, field, None)
+            hints = getattr(getattr(func, 'fget', func), 'display_field_hints', None)
+        if hints is not None:
+            _set_hints(accessor, model, hints)
+    return accessor
+
+
+def _get_accessor(view_class, model, field):
+    """
+    Returns the accessor to be used for the given display field (without hints).
+
+    The lookup order matches the one `BackboneAPIView.serialize` has always used: callables,
+    methods on the view, then fields, methods and properties on the model (after the
+    `annotated_fields` of the view).
+    """
+    if isinstance(field, IncludedField):
+        return IncludedAccessor(field.name, model._meta.get_field(field.name), field.view, field.fields)
+
+    annotated_fields = getattr(view_class, 'annotated_fields', None) or {}
+    if not callable(field) and field in annotated_fields:
+        return AnnotationAccessor(field, annotated_fields[field], model)
+
+    if callable(field):
+        return CallableAccessor(field)
+
+    if callable(getattr(view_class, field, None)):
+        return ViewMethodAccessor(field)
+
+    try:
+        model_field = model._meta.get_field(field)
+    except FieldDoesNotExist:
+        model_field = None
+
+    if model_field is not None:
+        if model_field.many_to_many and not model_field.auto_created:
+            return ManyToManyAccessor(field, model_field)
+        elif model_field.concrete and model_field.name == field:
+            if model_field.is_relation:
+                return ForeignKeyAccessor(field, model_field)
+            elif model_field.primary_key or not model_field.serialize:
+                return PrimaryKeyAccessor(field, model_field)
+            else:
+                return ColumnAccessor(field, model_field)
+
+    attr = getattr(model, field, None)
+    if callable(attr) and not isinstance(attr, type):
+        return ModelMethodAccessor(field)
+    # Properties, as well as attributes that are only set on instances (these are
+    # validated when the object is serialized).
+    return AttributeAccessor(field)
+
+
+def compile_field_plan(view_class, model, fields):
+    """
+    Compiles the given list of display fields into a `FieldPlan`.
+    """
+    return FieldPlan([get_accessor(view_class, model, field) for field in fields])
+
+
+def get_field_name(field):
+    """
+    Returns the name of the given display field (the key under which it is serialized).
+    """
+    if isinstance(field, IncludedField):
+        return field.name
+    return field.__name__ if callable(field) else field
+
+
+def select_fields(fields, names):
+    """
+    Returns the given display fields narrowed to the given names, keeping their order
+    (and always keeping the ``id``).
+
+    Raises `InvalidFields` if any of the names isn't one of the display fields.
+    """
+    names = set(name.strip() for name in names if name.strip())
+    available = set(get_field_name(field) for field in fields)
+    invalid = sorted(names - available)
+    if invalid:
+        raise InvalidFields(', '.join(invalid))
+    return [field for field in fields if field == 'id' or get_field_name(field) in names]
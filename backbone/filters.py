@@ -0,0 +1,125 @@
+from __future__ import unicode_literals
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import BooleanField, NullBooleanField
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext as _
+
+try:
+    # Django versions >= 1.8
+    from django.core.exceptions import FieldDoesNotExist
+except ImportError:
+    # Django versions < 1.8
+    from django.db.models.fields import FieldDoesNotExist
+
+LOOKUPS = ('exact', 'in', 'range', 'gt', 'gte', 'lt', 'lte', 'isnull')
+
+BOOLEANS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class InvalidFilter(Exception):
+
+    def __init__(self, param, message):
+        super(InvalidFilter, self).__init__(message)
+        self.param = param
+        self.message = message
+
+
+def get_filter_params(model, filter_fields):
+    """
+    Returns a dict mapping the query parameters allowed by the given `filter_fields` (a dict
+    mapping field names to lists of lookups) to their (field, lookup) tuples.
+
+    The parameter of an ``exact`` lookup is the field name itself, and the others are named
+    like their ORM lookup, e.g. ``price__gte``.
+    """
+    params = {}
+    for name, lookups in filter_fields.items():
+        field = model._meta.get_field(name)
+        if not field.concrete or field.many_to_many:
+            raise ImproperlyConfigured('Only concrete fields can be filtered. Invalid field: %s' % name)
+        for lookup in lookups:
+            if lookup not in LOOKUPS:
+                raise ImproperlyConfigured('Unsupported lookup: %s__%s' % (name, lookup))
+            params[name if lookup == 'exact' else '%s__%s' % (name, lookup)] = (field, lookup)
+    return params
+
+
+def get_filter_kwargs(params, query):
+    """
+    Returns the `QuerySet.filter()` keyword arguments for the allowed parameters (see
+    `get_filter_params`) found in the given query dict. Other parameters are ignored.
+
+    Values are converted with the `to_python()` of their field (booleans, like ``isnull``
+    values, are ``true``/``false`` or ``1``/``0``); lists of values (for ``in`` and ``range``
+    lookups) are separated by commas.
+
+    Raises `InvalidFilter` if a value can't be converted.
+    """
+    kwargs = {}
+    for param, (field, lookup) in params.items():
+        if param not in query:
+            continue
+        value = query[param]
+        # Relations are filtered by the value of the related field (e.g. the primary key)
+        target = field.foreign_related_fields[0] if field.is_relation else field
+        try:
+            if lookup == 'isnull' or (lookup == 'exact' and isinstance(target, (BooleanField, NullBooleanField))):
+                if value.lower() not in BOOLEANS:
+                    raise ValidationError(_('Expected true or false.'))
+                kwargs[param] = BOOLEANS[value.lower()]
+            elif lookup in ('in', 'range'):
+                values = [target.to_python(item) for item in value.split(',')]
+                if lookup == 'range' and len(values) != 2:
+                    raise ValidationError(_('Expected two values separated by a comma.'))
+                kwargs[param] = values
+            else:
+                kwargs[param] = target.to_python(value)
+        except ValidationError as e:
+            raise InvalidFilter(param, ' '.join(force_text(message) for message in e.messages))
+    return kwargs
+
+
+def get_ordering(value, ordering_fields, model, cursor=False):
+    """
+    Returns the ordering requested by the given (comma separated) value of an ``ordering``
+    parameter, e.g. ``-price,name``, with the primary key appended so that it is deterministic.
+
+    Raises `InvalidFilter` if a field isn't one of the given `ordering_fields`, or if `cursor`
+    is True (for cursor pagination) and the field isn't a non-nullable, concrete field of the model.
+    """
+    pk_names = ('pk', model._meta.pk.name)
+    ordering = []
+    for name in value.split(','):
+        name = name.strip()
+        field_name = name[1:] if name.startswith('-') else name
+        if field_name not in ordering_fields and field_name not in pk_names:
+            raise InvalidFilter('ordering', _('Invalid field: %s') % field_name)
+        if cursor and field_name not in pk_names:
+            try:
+                field = model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            if field is None or not field.concrete or field.null:
+                raise InvalidFilter('ordering', _('Cannot paginate by the field: %s') % field_name)
+        ordering.append(name)
+        if field_name in pk_names:
+            # The ordering is already deterministic
+            return ordering
+    return ordering + ['pk']
+
+
+def get_ids(value, model, max_count):
+    """
+    Returns the list of primary keys in the given (comma separated) value of an ``ids``
+    parameter, e.g. ``1,2,3``.
+
+    Raises `InvalidFilter` if an id is invalid or there are more than `max_count` ids.
+    """
+    ids = [item.strip() for item in value.split(',') if item.strip()]
+    if len(ids) > max_count:
+        raise InvalidFilter('ids', _('Too many ids (the maximum is %d).') % max_count)
+    try:
+        return [model._meta.pk.to_python(id) for id in ids]
+    except ValidationError as e:
+        raise InvalidFilter('ids', ' '.join(force_text(message) for message in e.messages))
@@ -0,0 +1,14 @@
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from backbone.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Deletes the tombstones of deleted objects older than BACKBONE_TOMBSTONE_RETENTION.'
+
+    def handle(self, *args, **options):
+        count = prune_tombstones()
+        if options['verbosity'] > 0:
+            self.stdout.write('Deleted %d tombstones.' % count)
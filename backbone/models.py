@@ -0,0 +1,18 @@
+from __future__ import unicode_literals
+
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    Records the deletion of an object of a model whose views support delta syncs
+    (see `BackboneAPIView.delta_sync`).
+    """
+    model = models.CharField(max_length=255)  # The app label and name of the model, e.g. ``fooapp.foo``.
+    object_id = models.CharField(max_length=255)
+    deletion_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        index_together = [('model', 'deletion_date')]
+        ordering = ('deletion_date', 'id')
@@ -0,0 +1,148 @@
+from __future__ import unicode_literals
+
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.encoding import smart_text
+from django.utils.functional import cached_property
+
+from backbone.cache import get_cached_count
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CachedCountPaginator(Paginator):
+    """
+    A paginator whose total count is read from the cache (see `backbone.cache.get_cached_count`),
+    so that page requests don't run a ``COUNT(*)`` query every time.
+    """
+
+    def __init__(self, object_list, per_page, cache_timeout=None, **kwargs):
+        super(CachedCountPaginator, self).__init__(object_list, per_page, **kwargs)
+        self.cache_timeout = cache_timeout
+
+    @cached_property
+    def count(self):
+        return get_cached_count(self.object_list, self.cache_timeout)
+
+
+class CursorPaginator(object):
+    """
+    Keyset (cursor) pagination.
+
+    Each page seeks past the last object of the previous page with an indexed
+    ``WHERE (order, id) > (...)`` condition instead of an ``OFFSET``, and no ``COUNT(*)``
+    is needed, so every page costs the same no matter how deep it is. The position is
+    passed between pages as an opaque (signed) cursor token.
+
+    The ordering must consist of non-nullable, concrete fields of the model; the primary
+    key is appended to it (if not already there) so that the ordering is deterministic.
+    """
+    salt = 'backbone.pagination.CursorPaginator'
+
+    def __init__(self, queryset, per_page, ordering=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = self.get_ordering(queryset.model, ordering or [])
+
+    def get_ordering(self, model, ordering):
+        """
+        Returns the ordering as a list of (field, descending) tuples, ending with the primary key.
+        """
+        opts = model._meta
+        result = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+            if not field.concrete or field.null:
+                raise ImproperlyConfigured(
+                    'Cursor pagination requires non-nullable, concrete fields. Invalid field: %s' % name
+                )
+            result.append((field, descending))
+            if field.primary_key:
+                # The ordering is already deterministic
+                return result
+        result.append((opts.pk, False))
+        return result
+
+    @property
+    def field_names(self):
+        return [field.name for field, descending in self.ordering]
+
+    def order_by(self):
+        order_by = []
+        for field, descending in self.ordering:
+            # Order relations by the column itself rather than by the related model's ordering
+            name = '%s__pk' % field.name if field.is_relation else field.name
+            order_by.append('-' + name if descending else name)
+        return order_by
+
+    def page(self, cursor=None):
+        """
+        Returns the (unevaluated) queryset for the page following the given cursor.
+
+        The queryset contains up to ``per_page + 1`` objects; the extra object only tells
+        whether there is a next page (see `get_next_cursor`).
+        """
+        qs = self.queryset.order_by(*self.order_by())
+        names, defer = qs.query.deferred_loading
+        if names and not defer:
+            # The ordering fields are needed for the next cursor
+            qs = qs.only(*(list(names) + self.field_names))
+        if cursor:
+            qs = qs.filter(self.get_seek_filter(self.decode_cursor(cursor)))
+        return qs[:self.per_page + 1]
+
+    def get_seek_filter(self, values):
+        """
+        Returns the filter that selects the objects positioned after the given values,
+        i.e. ``a > x OR (a = x AND (b > y OR (b = y AND ...)))``.
+        """
+        seek = None
+        for (field, descending), value in reversed(list(zip(self.ordering, values))):
+            condition = Q(**{'%s__%s' % (field.name, 'lt' if descending else 'gt'): value})
+            if seek is not None:
+                condition |= Q(**{field.name: value}) & seek
+            seek = condition
+        return seek
+
+    def get_next_cursor(self, items):
+        """
+        Returns the cursor for the page following the given (evaluated) page of items, or
+        None if it is the last page.
+
+        Items can either be model instances, or dicts returned by `QuerySet.values()` that
+        include the fields listed in `field_names`.
+        """
+        if len(items) <= self.per_page:
+            return None
+        last = items[self.per_page - 1]
+        if isinstance(last, dict):
+            values = [last[field.name] for field, descending in self.ordering]
+        else:
+            values = [getattr(last, field.attname) for field, descending in self.ordering]
+        return self.encode_cursor(values)
+
+    def encode_cursor(self, values):
+        values = [
+            value if value is None or isinstance(value, (bool, int, float)) else smart_text(value)
+            for value in values
+        ]
+        # The ordering is part of the cursor, which is only valid for the same ordering
+        return signing.dumps([self.order_by(), values], salt=self.salt, compress=True)
+
+    def decode_cursor(self, cursor):
+        try:
+            ordering, values = signing.loads(cursor, salt=self.salt)
+        except (signing.BadSignature, TypeError, ValueError):
+            raise InvalidCursor
+        if ordering != self.order_by() or not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor
+        try:
+            return [field.to_python(value) for (field, descending), value in zip(self.ordering, values)]
+        except ValidationError:
+            raise InvalidCursor
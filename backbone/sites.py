@@ -1,10 +1,37 @@
 from __future__ import unicode_literals
 
+import copy
+import json
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import (
+    Resolver404, get_script_prefix, get_urlconf, resolve, set_script_prefix, set_urlconf
+)
+from django.db import connections
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed, QueryDict
+from django.utils import six, translation
+from django.utils.encoding import force_bytes, force_text
+from django.utils.six.moves.urllib.parse import urlsplit
+from django.utils.translation import ugettext as _
+
+from backbone.cache import track_generations
+from backbone.encoders import get_json_backend
+from backbone.events import track_events
+from backbone.sync import track_deletions
+
 
 class BackboneSite(object):
+    dispatch_table = False  # Resolve the URLs of all the views with a dict lookup, instead of a pattern per view.
+    batch_requests = False  # Provide a ``batch`` URL for sending several requests in a single one.
+    max_batch_requests = 20  # The max number of requests in a batch.
+    batch_threads = 0  # Run batches of get requests concurrently in this many threads (when not in a transaction).
+    batch_methods = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
 
     def __init__(self, name='backbone'):
         self._registry = []
+        self._views = {}
         self.name = name
 
     def register(self, backbone_view_class):
@@ -13,22 +40,69 @@ class BackboneSite(object):
         """
         if backbone_view_class not in self._registry:
             self._registry.append(backbone_view_class)
+            # As with URL patterns, the first view registered for a URL is used.
+            self._views.setdefault(self.get_url_parts(backbone_view_class), backbone_view_class.as_view())
+
+        if backbone_view_class.change_feed:
+            track_events(backbone_view_class.model)
+
+        if backbone_view_class.delta_sync:
+            track_deletions(backbone_view_class.model)
+
+        # Changes have to invalidate the cache even in processes that never read from it. All the
+        # views are tracked again, since included relations can only be resolved once the views
+        # of their models are registered.
+        for view_class in self._registry:
+            if any(timeout is not None for timeout in (view_class.cache_timeout, view_class.count_cache_timeout)):
+                for model in view_class().get_all_cache_dependencies():
+                    track_generations(model)
 
     def unregister(self, backbone_view_class):
         if backbone_view_class in self._registry:
             self._registry.remove(backbone_view_class)
+            parts = self.get_url_parts(backbone_view_class)
+            del self._views[parts]
+            for view_class in self._registry:
+                if self.get_url_parts(view_class) == parts:
+                    self._views[parts] = view_class.as_view()
+                    break
+
+    def get_view_class(self, model):
+        """
+        Returns the first backbone view class registered for the given model, or None.
+        """
+        for view_class in self._registry:
+            if view_class.model is model:
+                return view_class
+        return None
+
+    def get_url_parts(self, backbone_view_class):
+        """
+        Returns the (app label, url slug) of the URLs of the given backbone view class.
+        """
+        opts = backbone_view_class.model._meta
+        url_slug = backbone_view_class.url_slug or (
+            opts.model_name if hasattr(opts, 'model_name') else opts.module_name
+        )
+        return opts.app_label, url_slug
 
     def get_urls(self):
         from django.conf.urls import url
 
         urlpatterns = []
-        for view_class in self._registry:
-            app_label = view_class.model._meta.app_label
+        if self.batch_requests:
+            urlpatterns.append(url(r'^batch$', self.batch_view, name='batch'))
 
-            opts = view_class.model._meta
-            url_slug = view_class.url_slug or (
-                opts.model_name if hasattr(opts, 'model_name') else opts.module_name
-            )
+        if self.dispatch_table:
+            # These two patterns match the URLs of all the views (see `dispatch_view`). The patterns
+            # of the views are still added below, but only to reverse the URLs by name.
+            urlpatterns = urlpatterns + [
+                url(r'^(?P<app_label>[^/]+)/(?P<url_slug>[^/]+)$', self.dispatch_view),
+                url(r'^(?P<app_label>[^/]+)/(?P<url_slug>[^/]+)/(?P<id>\d+)$', self.dispatch_view),
+            ]
+
+        for view_class in self._registry:
+            app_label, url_slug = self.get_url_parts(view_class)
 
             url_path_prefix = r'^%s/%s' % (app_label, url_slug)
             base_url_name = '%s_%s' % (app_label, url_slug)
@@ -38,8 +112,160 @@ class BackboneSite(object):
                 url(url_path_prefix + '/(?P<id>\d+)$', view_class.as_view(),
                     name=base_url_name + '_detail')
             ]
+            if view_class.change_feed:
+                urlpatterns.append(url(url_path_prefix + '/events$', view_class.as_view(),
+                    {'change_feed': True}, name=base_url_name + '_events'))
         return urlpatterns
 
+    def dispatch_view(self, request, app_label, url_slug, id=None):
+        """
+        Dispatches the request to the view registered for the given app label and url slug
+        (when using `dispatch_table`).
+        """
+        view = self._views.get((app_label, url_slug))
+        if view is None:
+            raise Http404
+        if id is None:
+            return view(request)
+        return view(request, id=id)
+
+    def batch_view(self, request):
+        """
+        Handles a batch of requests to the registered views, sent as a JSON list of
+        ``{"method": ..., "path": ..., "body": ...}`` objects.
+
+        Returns the list of the responses (``{"status": ..., "headers": ..., "body": ...}``),
+        in the same order. The requests are handled one after the other, unless they are all
+        get requests and `batch_threads` is set (and no transaction is in progress), in which
+        case they are handled concurrently.
+        """
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return HttpResponseBadRequest(_('Unable to parse JSON request body.'))
+
+        if not isinstance(data, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('path'), six.string_types) and
+            item.get('method', 'GET') in self.batch_methods
+            for item in data
+        ):
+            return HttpResponseBadRequest(_('Expected a list of requests with a method and a path.'))
+        if len(data) > self.max_batch_requests:
+            return HttpResponseBadRequest(
+                _('Too many requests (the maximum is %d).') % self.max_batch_requests
+            )
+
+        sub_requests = [self.get_batch_sub_request(request, item) for item in data]
+        in_transaction = any(connection.in_atomic_block for connection in connections.all())
+        if self.batch_threads and not in_transaction and all(r.method == 'GET' for r in sub_requests):
+            # The threads get the active language, urlconf and script prefix of this one
+            context = (translation.get_language(), get_urlconf(), get_script_prefix())
+            pool = ThreadPool(min(self.batch_threads, len(sub_requests)))
+            try:
+                responses = pool.map(
+                    self._handle_batch_sub_request_in_thread, [(sub_request, context) for sub_request in sub_requests]
+                )
+            finally:
+                pool.close()
+        else:
+            responses = []
+            cookies = {}
+            for sub_request in sub_requests:
+                # The cookies set by the previous requests are sent with the next ones (e.g. for
+                # the next requests to read from the database written to)
+                sub_request.COOKIES = dict(request.COOKIES)
+                sub_request.COOKIES.update(cookies)
+                response = self.handle_batch_sub_request(sub_request)
+                cookies.update((name, morsel.value) for name, morsel in response.cookies.items())
+                responses.append(response)
+
+        # The JSON responses are included as is, without being decoded and encoded again
+        json_backend = get_json_backend(getattr(settings, 'BACKBONE_JSON_BACKEND', None))
+        items = []
+        for response in responses:
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                content = response.content
+            if not response.get('Content-Type', '').startswith('application/json') or not content:
+                content = json_backend.dumps(force_text(content) or None)
+            headers = dict((header, value) for header, value in response.items() if header != 'Content-Type')
+            items.append('{"status":%d,"headers":%s,"body":%s}' % (
+                response.status_code, json_backend.dumps(headers), force_text(content)
+            ))
+        batch_response = HttpResponse('[%s]' % ','.join(items), content_type='application/json')
+        for response in responses:
+            batch_response.cookies.update(response.cookies)
+        return batch_response
+
+    def get_batch_sub_request(self, request, item):
+        """
+        Returns the request for the given item of a batch, which is a copy of the batch request
+        (with the same user, session, etc.) with the method, path and body of the item.
+        """
+        path, query = urlsplit(item['path'])[2:4]
+        script_prefix = get_script_prefix()
+        path_info = '/' + path[len(script_prefix):] if path.startswith(script_prefix) else path
+        body = force_bytes(json.dumps(item['body'])) if 'body' in item else b''
+
+        sub_request = copy.copy(request)
+        sub_request.method = item.get('method', 'GET')
+        sub_request.path = path
+        sub_request.path_info = path_info
+        sub_request.GET = QueryDict(query)
+        sub_request.META = dict(
+            request.META, REQUEST_METHOD=sub_request.method, PATH_INFO=path_info,
+            QUERY_STRING=query, CONTENT_TYPE='application/json', CONTENT_LENGTH=str(len(body))
+        )
+        sub_request._body = body
+        return sub_request
+
+    def handle_batch_sub_request(self, sub_request):
+        """
+        Returns the response of the registered view the given request of a batch is for.
+
+        Only the views of this site can be requested, and not their change feeds (which never
+        end).
+        """
+        try:
+            match = resolve(sub_request.path_info)
+        except Resolver404:
+            match = None
+        if match is None or self.name not in match.namespaces or match.url_name == 'batch':
+            return HttpResponse(status=404)
+        if match.kwargs.get('change_feed'):
+            return HttpResponseBadRequest(_('Change feeds cannot be requested in a batch.'))
+        sub_request.resolver_match = match
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except Http404:
+            return HttpResponse(status=404)
+        except PermissionDenied:
+            return HttpResponse(status=403)
+        if response.streaming and not response.get('Content-Type', '').startswith('application/json'):
+            # Only streamed JSON collections are known to end; anything else (e.g. an event
+            # stream) could block the batch forever.
+            response.close()
+            return HttpResponseBadRequest(_('Streaming responses cannot be requested in a batch.'))
+        return response
+
+    def _handle_batch_sub_request_in_thread(self, args):
+        sub_request, (language, urlconf, script_prefix) = args
+        if language:
+            translation.activate(language)
+        set_urlconf(urlconf)
+        set_script_prefix(script_prefix)
+        try:
+            return self.handle_batch_sub_request(sub_request)
+        finally:
+            translation.deactivate()
+            set_urlconf(None)
+            # Each thread has its own database connections
+            for connection in connections.all():
+                connection.close()
+
     @property
     def urls(self):
         return (self.get_urls(), 'backbone', self.name)
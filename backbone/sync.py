@@ -0,0 +1,104 @@
+from __future__ import unicode_literals
+
+import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext as _
+
+from backbone.filters import InvalidFilter
+from backbone.utils import get_model_label
+
+
+# Delta syncs return the objects changed since a sync token (using the `last_modified_field`
+# of the view), along with the ids of the objects deleted since then, which are recorded as
+# tombstones when the objects of a tracked model are deleted. Tombstones are kept for the
+# retention period (`BACKBONE_TOMBSTONE_RETENTION`), so older tokens can't be used.
+
+_tracked_models = set()
+
+salt = 'backbone.sync'
+
+DEFAULT_TOMBSTONE_RETENTION = 30 * 24 * 60 * 60  # 30 days
+
+
+def track_deletions(model):
+    """
+    Starts recording a tombstone whenever an object of the given model is deleted.
+    """
+    _tracked_models.add(model)
+
+
+def get_sync_token(margin=0):
+    """
+    Returns a new sync token, for the changes made from now on (or from the given number of
+    seconds ago).
+    """
+    return signing.dumps((timezone.now() - datetime.timedelta(seconds=margin)).isoformat(), salt=salt)
+
+
+def parse_sync_token(token):
+    """
+    Returns the date and time of the given sync token.
+
+    Raises `InvalidFilter` if the token is invalid, or older than the retention period of the
+    tombstones (since the deletions it would sync may have been pruned).
+    """
+    try:
+        value = parse_datetime(signing.loads(token, salt=salt))
+    except (signing.BadSignature, TypeError, ValueError):
+        value = None
+    if value is None:
+        raise InvalidFilter('since', _('Invalid sync token.'))
+    if value < get_retention_start():
+        raise InvalidFilter('since', _('Expired sync token (the whole collection has to be synced again).'))
+    return value
+
+
+def get_retention_start():
+    """
+    Returns the date and time from which the tombstones are kept (see `prune_tombstones`).
+    """
+    retention = getattr(settings, 'BACKBONE_TOMBSTONE_RETENTION', DEFAULT_TOMBSTONE_RETENTION)
+    return timezone.now() - datetime.timedelta(seconds=retention)
+
+
+def prune_tombstones():
+    """
+    Deletes the tombstones older than the retention period (the `BACKBONE_TOMBSTONE_RETENTION`
+    setting, in seconds), and returns their number.
+    """
+    from backbone.models import Tombstone
+
+    tombstones = Tombstone.objects.filter(deletion_date__lt=get_retention_start())
+    count = tombstones.count()
+    tombstones.delete()
+    return count
+
+
+def get_deleted_ids(model, since):
+    """
+    Returns the list of the ids of the objects of the given model deleted since the given date.
+    """
+    from backbone.models import Tombstone  # The models can't be imported before the app registry is ready
+
+    to_python = model._meta.pk.to_python
+    return [
+        to_python(object_id) for object_id in Tombstone.objects.filter(
+            model=get_model_label(model), deletion_date__gte=since
+        ).values_list('object_id', flat=True)
+    ]
+
+
+def _record_deletion(sender, instance, **kwargs):
+    if sender in _tracked_models:
+        from backbone.models import Tombstone
+
+        Tombstone.objects.create(model=get_model_label(sender), object_id=force_text(instance.pk))
+
+
+post_delete.connect(_record_deletion, dispatch_uid='backbone.sync.post_delete')
@@ -1,12 +1,16 @@
 from __future__ import unicode_literals
 
+from django.db.models import BooleanField, Case, Min, Value, When
+
 import backbone
+from backbone.fields import display_field
 from backbone.views import BackboneAPIView
 from backbone.tests.forms import BrandForm
-from backbone.tests.models import Product, Brand, ExtendedProduct, DisplayFieldsProduct
+from backbone.tests.models import Product, Brand, Category, ExtendedProduct, DisplayFieldsProduct
 
 
 class ProductBackboneView(BackboneAPIView):
+    @display_field(only=['sku'])
     def sku(obj):
         return '#: %s' % obj.sku
 
@@ -17,6 +21,12 @@ class ProductBackboneView(BackboneAPIView):
     fields = ('name', 'brand', 'categories', 'price', 'order', 'sale_date',)
     ordering = ('order', 'id')
 
+    display_field_hints = {
+        'is_priced_under_10': {'only': ['price']},
+        'get_first_category_id': {'only': [], 'prefetch_related': ['categories']},
+    }
+
+    @display_field(only=['name'])
     def custom2(self, obj):
         return 'custom2: %s' % obj.name
 
@@ -39,6 +49,29 @@ class ProductBackboneView(BackboneAPIView):
 backbone.site.register(ProductBackboneView)
 
 
+class SyncProductBackboneView(ProductBackboneView):
+    display_fields = ('name', 'brand', 'categories')
+    last_modified_field = 'modification_date'
+    delta_sync = True
+    change_feed = True
+    url_slug = 'product_sync'
+
+backbone.site.register(SyncProductBackboneView)
+
+
+class AnnotatedProductBackboneView(ProductBackboneView):
+    display_fields = ('name', 'price', 'is_priced_under_10', 'get_first_category_id')
+    annotated_fields = {
+        'is_priced_under_10': Case(
+            When(price__lt=10, then=Value(True)), default=Value(False), output_field=BooleanField()
+        ),
+        'get_first_category_id': Min('categories'),
+    }
+    url_slug = 'product_annotated'
+
+backbone.site.register(AnnotatedProductBackboneView)
+
+
 class BrandBackboneView(BackboneAPIView):
     model = Brand
     form = BrandForm
@@ -78,3 +111,10 @@ class DisplayFieldsProductBackboneView(BackboneAPIView):
     display_detail_fields = ('name', 'brand', 'categories',)
 
 backbone.site.register(DisplayFieldsProductBackboneView)
+
+
+class CategoryBackboneView(BackboneAPIView):
+    model = Category
+    display_fields = ['name']
+
+backbone.site.register(CategoryBackboneView)
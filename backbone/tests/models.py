@@ -20,6 +20,7 @@ class Category(models.Model):
 
 class Product(models.Model):
     creation_date = models.DateTimeField(auto_now_add=True)
+    modification_date = models.DateTimeField(auto_now=True)
     name = models.CharField(max_length=255)
     brand = models.ForeignKey(Brand, null=True, blank=True)
     categories = models.ManyToManyField(Category, blank=True)
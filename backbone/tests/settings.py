@@ -16,7 +16,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(os.path.dirname(__file__), 'backbone_tests.db'),
-    }
+    },
+    # Stands for a read replica
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(os.path.dirname(__file__), 'backbone_tests_replica.db'),
+    },
 }
 
 # This is just for backwards compatibility
@@ -2,15 +2,39 @@ from __future__ import unicode_literals
 
 import datetime
 from decimal import Decimal
+import itertools
 import json
+from unittest import skipUnless
+import uuid
 
+from django.conf import settings
 from django.contrib.auth.models import User, Permission
-from django.core.urlresolvers import reverse
-from django.test import TestCase
+from django.core import signing
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models.signals import post_init, post_save, pre_save
+from django.core.urlresolvers import get_urlconf, resolve, reverse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone, translation
 from django.utils.translation import ugettext as _
 
+import backbone
+import backbone.cache
+from backbone.encoders import BACKENDS, JSONBackend, get_json_backend
+from backbone.fields import display_field
+from backbone.events import get_broker, get_channel
+from backbone.models import Tombstone
+from backbone.sites import BackboneSite
+from backbone.sync import get_sync_token
 from backbone.tests.models import Product, Brand, Category, ExtendedProduct, DisplayFieldsProduct
-from backbone.tests.backbone_api import BrandBackboneView
+from backbone.tests.forms import BrandForm
+from backbone.tests.backbone_api import (
+    AnnotatedProductBackboneView, BrandBackboneView, ExtendedProductBackboneView, ProductBackboneView,
+    SyncProductBackboneView
+)
 
 
 class TestHelper(TestCase):
@@ -120,6 +144,51 @@ class CollectionTests(TestHelper):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['categories'], [cat1.id, cat2.id])
 
+    def test_collection_view_loads_related_fields_in_bulk(self):
+        cat1 = self.create_category()
+        cat2 = self.create_category()
+        for i in range(3):
+            p = self.create_product()
+            p.categories = [cat1, cat2]
+
+        url = reverse('backbone:tests_product')
+        # One query for the products and one for the prefetched categories.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        data = self.parseJsonResponse(response)
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]['categories'], [cat1.id, cat2.id])
+        self.assertEqual(data[0]['get_first_category_id'], cat1.id)
+
+    def test_collection_view_returns_requested_ids(self):
+        p1 = self.create_product()
+        p2 = self.create_product()
+        p3 = self.create_product(is_hidden=True)
+        self.create_product()
+        url = reverse('backbone:tests_product')
+        with self.assertNumQueries(2):  # Products and categories
+            response = self.client.get(url, {'ids': '%s,%s,%s' % (p3.id, p2.id, p1.id)})
+        data = self.parseJsonResponse(response)
+        self.assertEqual([item['id'] for item in data], [p1.id, p2.id])
+
+    def test_collection_view_with_requested_ids_is_not_paginated(self):
+        brands = [self.create_brand() for i in range(3)]
+        url = reverse('backbone:tests_brand')
+        response = self.client.get(url, {'ids': ','.join(str(brand.id) for brand in brands)})
+        self.assertEqual(len(self.parseJsonResponse(response)), 3)
+        self.assertFalse(response.has_header('Link'))
+
+    def test_collection_view_with_invalid_or_too_many_ids_returns_error(self):
+        url = reverse('backbone:tests_product')
+        response = self.client.get(url, {'ids': '1,a'})
+        self.assertEqual(response.status_code, 400)
+        ProductBackboneView.max_batch_size = 2
+        try:
+            response = self.client.get(url, {'ids': '1,2,3'})
+            self.assertEqual(response.status_code, 400)
+        finally:
+            del ProductBackboneView.max_batch_size
+
     def test_collection_view_with_custom_queryset(self):
         p1 = self.create_product()
         self.create_product(is_hidden=True)  # this should not appear
@@ -371,6 +440,19 @@ class AddTests(TestHelper):
         self.assertEqual(data['price'], [_('This field is required.')])
         self.assertEqual(data['order'], [_('This field is required.')])
 
+    def test_post_request_on_product_collection_view_returns_error_list_with_each_json_backend(self):
+        url = reverse('backbone:tests_product')
+        data = json.dumps({'name': '', 'brand': '', 'categories': [], 'price': None, 'order': ''})
+        try:
+            for name in BACKENDS:
+                ProductBackboneView.json_backend = name
+                response = self.client.post(url, data, content_type='application/json')
+                data_errors = self.parseJsonResponse(response, status_code=400)
+                self.assertEqual(data_errors['name'], [_('This field is required.')])
+                self.assertEqual(data_errors['order'], [_('This field is required.')])
+        finally:
+            del ProductBackboneView.json_backend
+
     def test_post_request_on_product_collection_view_ignores_fields_not_specified(self):
         brand = self.create_brand()
         cat1 = self.create_category()
@@ -434,6 +516,82 @@ class AddTests(TestHelper):
         self.assertEqual(len(data), 1)
         self.assertEqual(data['name'], [_('Brand name must start with a capital letter.')])
 
+    def test_post_request_with_list_on_product_collection_view_adds_products(self):
+        brand = self.create_brand()
+        category = self.create_category()
+        data = json.dumps([
+            {'name': 'Foo', 'brand': brand.id, 'categories': [category.id], 'price': 9.99, 'order': 1},
+            {'name': 'Bar', 'brand': brand.id, 'categories': [], 'price': 12, 'order': 2},
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.post(url, data, content_type='application/json')
+        data = self.parseJsonResponse(response, status_code=201)
+        products = list(Product.objects.all())
+        self.assertEqual([p.name for p in products], ['Foo', 'Bar'])
+        self.assertEqual([p.id for p in products], [item['id'] for item in data])
+        self.assertEqual(data[0]['categories'], [category.id])
+        self.assertEqual(data[1]['categories'], [])
+
+    def test_post_request_with_list_with_validation_errors_adds_nothing(self):
+        data = json.dumps([
+            {'name': 'Foo', 'price': 9.99, 'order': 1},
+            {'name': '', 'price': 12, 'order': 2},
+            'Bar',
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.post(url, data, content_type='application/json')
+        data = self.parseJsonResponse(response, status_code=400)
+        self.assertEqual(Product.objects.count(), 0)
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0], {})
+        self.assertEqual(list(data[1]), ['name'])
+        self.assertEqual(list(data[2]), ['__all__'])
+
+    def test_post_request_with_list_violating_field_specific_permission_adds_nothing(self):
+        data = json.dumps([
+            {'name': 'Foo', 'price': 9.99, 'order': 1},
+            {'name': 'NOTALLOWED', 'price': 12, 'order': 2},
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.post(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Product.objects.count(), 0)
+
+    def test_post_request_with_list_larger_than_max_batch_size_returns_error(self):
+        ProductBackboneView.max_batch_size = 1
+        try:
+            data = json.dumps([{'name': 'Foo', 'price': 1, 'order': 1}, {'name': 'Bar', 'price': 2, 'order': 2}])
+            url = reverse('backbone:tests_product')
+            response = self.client.post(url, data, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(Product.objects.count(), 0)
+        finally:
+            del ProductBackboneView.max_batch_size
+
+    def test_objects_are_not_bulk_created_when_the_model_has_save_receivers(self):
+        # bulk_create() doesn't send the pre_save and post_save signals
+        def receiver(sender, **kwargs):
+            pass
+
+        connection.features.can_return_ids_from_bulk_insert = True
+        try:
+            self.assertTrue(BrandBackboneView().can_bulk_create([]))
+            for signal in (pre_save, post_save):
+                signal.connect(receiver, sender=Brand)
+                try:
+                    self.assertFalse(BrandBackboneView().can_bulk_create([]))
+                finally:
+                    signal.disconnect(receiver, sender=Brand)
+        finally:
+            del connection.features.can_return_ids_from_bulk_insert
+
+    def test_form_class_is_built_once_per_view_class(self):
+        form_class = BrandBackboneView().get_form_class(None)
+        self.assertTrue(issubclass(form_class, BrandForm))
+        self.assertEqual(list(form_class.base_fields), ['name'])
+        self.assertIs(BrandBackboneView().get_form_class(None), form_class)
+        self.assertIsNot(ProductBackboneView().get_form_class(None), form_class)
+
     def test_post_request_on_custom_url_slug_view_contains_custom_url_in_location_header(self):
         data = json.dumps({
             'name': 'Foo',
@@ -585,6 +743,143 @@ class UpdateTests(TestHelper):
         self.assertEqual(len(data), 1)
         self.assertEqual(data['name'], [_('Brand name must start with a capital letter.')])
 
+    def test_patch_request_on_product_detail_view_updates_only_the_sent_fields(self):
+        category = self.create_category()
+        product = self.create_product(name='Foo', order=1)
+        product.categories.add(category)
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, json.dumps({'order': 5}), content_type='application/json')
+        data = self.parseJsonResponse(response)
+        self.assertEqual(data['order'], 5)
+        self.assertEqual(data['name'], 'Foo')
+        self.assertEqual(data['categories'], [category.id])
+
+        updates = [query['sql'] for query in queries if 'UPDATE "tests_product"' in query['sql']]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"order"', updates[0])
+        self.assertIn('"modification_date"', updates[0])
+        self.assertNotIn('"name"', updates[0])
+
+        product = Product.objects.get(id=product.id)
+        self.assertEqual(product.order, 5)
+        self.assertEqual(product.name, 'Foo')
+        self.assertEqual(product.price, Decimal('12.32'))
+
+    def test_patch_request_on_product_detail_view_updates_m2m_field(self):
+        category = self.create_category()
+        product = self.create_product()
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        data = json.dumps({'categories': [category.id]})
+        response = self.client.patch(url, data, content_type='application/json')
+        data = self.parseJsonResponse(response)
+        self.assertEqual(data['categories'], [category.id])
+        self.assertEqual(list(product.categories.all()), [category])
+
+    def test_patch_request_on_product_detail_view_with_validation_errors_returns_error_list_as_json(self):
+        product = self.create_product(name='Foo')
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        data = json.dumps({'name': '', 'order': 'x'})
+        response = self.client.patch(url, data, content_type='application/json')
+        data = self.parseJsonResponse(response, status_code=400)
+        self.assertEqual(sorted(data), ['name', 'order'])
+        self.assertEqual(Product.objects.get(id=product.id).name, 'Foo')
+
+    def test_patch_request_on_product_detail_view_violating_field_specific_permission_returns_403(self):
+        product = self.create_product(name='NOTALLOWED')
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        response = self.client.patch(url, json.dumps({'order': 5}), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Product.objects.get(id=product.id).order, 0)
+
+    def test_patch_request_passes_current_values_of_unsent_fields_to_permission_hook(self):
+        brand = self.create_brand()
+        category = self.create_category()
+        product = self.create_product(name='Foo', brand=brand)
+        product.categories.add(category)
+        hook_data = []
+
+        view = ProductBackboneView()
+        view.has_update_permission_for_data = lambda request, cleaned_data: hook_data.append(cleaned_data) or True
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        request = RequestFactory().patch(url, json.dumps({'order': 5}), content_type='application/json')
+        response = view.partial_update_object(request, Product.objects.get(id=product.id))
+        self.assertEqual(response.status_code, 200)
+
+        cleaned_data = hook_data[0]
+        self.assertEqual(cleaned_data['order'], 5)
+        self.assertEqual(cleaned_data['name'], 'Foo')
+        self.assertEqual(cleaned_data['price'], Decimal('12.32'))
+        # The same types as the cleaned values of a PUT request
+        self.assertEqual(cleaned_data['brand'], brand)
+        self.assertEqual(list(cleaned_data['categories']), [category])
+
+    def test_patch_request_on_product_detail_view_when_user_not_logged_in_returns_403(self):
+        self.client.logout()
+        product = self.create_product()
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        response = self.client.patch(url, json.dumps({'order': 5}), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_patch_request_on_brand_detail_view_uses_custom_model_form(self):
+        brand = self.create_brand()
+        url = reverse('backbone:tests_brand_detail', args=[brand.id])
+        response = self.client.patch(url, json.dumps({'name': 'foo'}), content_type='application/json')
+        data = self.parseJsonResponse(response, status_code=400)
+        self.assertEqual(data['name'], [_('Brand name must start with a capital letter.')])
+
+    def test_put_request_with_list_on_product_collection_view_updates_products(self):
+        p1 = self.create_product(name='Foo')
+        p2 = self.create_product(name='Bar')
+        data = json.dumps([
+            {'id': p2.id, 'name': 'Bar 2', 'price': 2, 'order': 2},
+            {'id': p1.id, 'name': 'Foo 2', 'price': 1, 'order': 1},
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.put(url, data, content_type='application/json')
+        data = self.parseJsonResponse(response)
+        self.assertEqual([item['id'] for item in data], [p2.id, p1.id])
+        self.assertEqual([item['name'] for item in data], ['Bar 2', 'Foo 2'])
+        self.assertEqual([p.name for p in Product.objects.all()], ['Foo 2', 'Bar 2'])
+
+    def test_put_request_with_list_with_validation_errors_updates_nothing(self):
+        p1 = self.create_product(name='Foo')
+        p2 = self.create_product(name='Bar')
+        data = json.dumps([
+            {'id': p1.id, 'name': 'Foo 2', 'price': 1, 'order': 1},
+            {'id': p2.id, 'name': '', 'price': 2, 'order': 2},
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.put(url, data, content_type='application/json')
+        data = self.parseJsonResponse(response, status_code=400)
+        self.assertEqual(data[0], {})
+        self.assertEqual(list(data[1]), ['name'])
+        self.assertEqual([p.name for p in Product.objects.all()], ['Foo', 'Bar'])
+
+    def test_put_request_with_list_including_object_not_in_queryset_returns_404(self):
+        p1 = self.create_product(name='Foo')
+        p2 = self.create_product(name='Bar', is_hidden=True)
+        data = json.dumps([
+            {'id': p1.id, 'name': 'Foo 2', 'price': 1, 'order': 1},
+            {'id': p2.id, 'name': 'Bar 2', 'price': 2, 'order': 2},
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.put(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Product.objects.get(id=p1.id).name, 'Foo')
+
+    def test_put_request_with_list_violating_field_specific_permission_updates_nothing(self):
+        p1 = self.create_product(name='Foo')
+        p2 = self.create_product(name='Bar')
+        data = json.dumps([
+            {'id': p1.id, 'name': 'Foo 2', 'price': 1, 'order': 1},
+            {'id': p2.id, 'name': 'NOTALLOWED', 'price': 2, 'order': 2},
+        ])
+        url = reverse('backbone:tests_product')
+        response = self.client.put(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual([p.name for p in Product.objects.all()], ['Foo', 'Bar'])
+
 
 class DeleteTests(TestHelper):
 
@@ -630,6 +925,55 @@ class DeleteTests(TestHelper):
         self.assertEqual(response.content, _('You do not have permission to perform this action.'))
         self.assertEqual(Brand.objects.count(), 1)
 
+    def test_delete_request_with_list_on_product_collection_view_deletes_products(self):
+        p1 = self.create_product()
+        p2 = self.create_product()
+        p3 = self.create_product()
+        url = reverse('backbone:tests_product')
+        # Session and user, permissions, products, and a single (cascading) delete in a savepoint,
+        # along with a tombstone for each product (see SyncProductBackboneView).
+        with self.assertNumQueries(14):
+            response = self.client.delete(url, json.dumps([p1.id, p3.id]), content_type='application/json')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(list(Product.objects.all()), [p2])
+
+    def test_delete_request_with_list_including_missing_object_returns_404(self):
+        p1 = self.create_product()
+        url = reverse('backbone:tests_product')
+        response = self.client.delete(url, json.dumps([p1.id, p1.id + 1]), content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_collection_requests_with_invalid_ids_return_error(self):
+        product = self.create_product()
+        url = reverse('backbone:tests_product')
+        for ids in (['abc'], [[product.id]], [{'a': product.id}], [{'id': product.id}], [None], [True]):
+            response = self.client.delete(url, json.dumps(ids), content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            response = self.client.put(
+                url, json.dumps([{'id': id, 'name': 'Foo'} for id in ids]), content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 400)
+        response = self.client.delete(url, json.dumps(['abc']), content_type='application/json')
+        self.assertEqual(response.content, (_('Invalid id: %s') % '"abc"').encode('utf-8'))
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_delete_request_with_list_on_brand_returns_403(self):
+        brand = self.create_brand()
+        url = reverse('backbone:tests_brand')
+        response = self.client.delete(url, json.dumps([brand.id]), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Brand.objects.count(), 1)
+
+    def test_collection_requests_with_invalid_json_return_error(self):
+        url = reverse('backbone:tests_product')
+        for method in (self.client.put, self.client.delete):
+            response = method(url, 'Some invalid json', content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.content, _('Unable to parse JSON request body.').encode('utf-8'))
+        response = self.client.delete(url, json.dumps({'id': 1}), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
 
 class InheritanceTests(TestHelper):
 
@@ -654,6 +998,1207 @@ class InheritanceTests(TestHelper):
         self.assertEqual(data['get_first_category_id'], category.id)
 
 
+class PaginationTests(TestHelper):
+
+    def setUp(self):
+        cache.clear()
+        BrandBackboneView.paginate_count = True
+        BrandBackboneView.count_cache_timeout = None
+        self.brands = [self.create_brand(name='Brand %s' % i) for i in range(3)]
+        self.url = reverse('backbone:tests_brand')
+
+    def tearDown(self):
+        del BrandBackboneView.paginate_count
+        del BrandBackboneView.count_cache_timeout
+
+    def test_paginated_collection_returns_total_count_and_link_to_next_page(self):
+        response = self.client.get(self.url, {'page': 1})
+        self.assertEqual(len(self.parseJsonResponse(response)), 2)
+        self.assertEqual(response['X-Total-Count'], '3')
+        self.assertTrue(response['Link'].endswith('?page=2>; rel="next"'))
+
+        response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(len(self.parseJsonResponse(response)), 1)
+        self.assertFalse(response.has_header('Link'))
+
+    def test_pagination_without_count_fetches_one_extra_object_instead_of_counting(self):
+        BrandBackboneView.paginate_count = False
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'page': 1})
+        data = self.parseJsonResponse(response)
+        self.assertEqual([item['id'] for item in data], [self.brands[0].id, self.brands[1].id])
+        self.assertFalse(response.has_header('X-Total-Count'))
+        self.assertTrue(response['Link'].endswith('?page=2>; rel="next"'))
+
+        response = self.client.get(self.url, {'page': 2})
+        data = self.parseJsonResponse(response)
+        self.assertEqual([item['id'] for item in data], [self.brands[2].id])
+        self.assertFalse(response.has_header('Link'))
+
+    def test_pagination_without_count_page_parameter_out_of_range_returns_error(self):
+        BrandBackboneView.paginate_count = False
+        for page in (3, 0):
+            response = self.client.get(self.url, {'page': page})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.content.decode('utf-8'), _('Invalid `page` parameter: Out of range.'))
+
+    def test_pagination_without_count_page_parameter_not_an_integer_returns_error(self):
+        BrandBackboneView.paginate_count = False
+        response = self.client.get(self.url, {'page': 'abcd'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content.decode('utf-8'), _('Invalid `page` parameter: Not a valid integer.'))
+
+    def test_cached_count_is_reused_until_objects_are_changed(self):
+        BrandBackboneView.count_cache_timeout = 60
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'page': 1})
+        self.assertEqual(response['X-Total-Count'], '3')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'page': 2})
+        self.assertEqual(response['X-Total-Count'], '3')
+
+        self.create_brand()
+        response = self.client.get(self.url, {'page': 1})
+        self.assertEqual(response['X-Total-Count'], '4')
+
+        self.brands[0].delete()
+        response = self.client.get(self.url, {'page': 1})
+        self.assertEqual(response['X-Total-Count'], '3')
+
+
+class CursorPaginationTests(TestHelper):
+
+    def setUp(self):
+        ProductBackboneView.paginate_by = 2
+        ProductBackboneView.cursor_pagination = True
+        BrandBackboneView.cursor_pagination = True
+
+    def tearDown(self):
+        del ProductBackboneView.paginate_by
+        del ProductBackboneView.cursor_pagination
+        del BrandBackboneView.cursor_pagination
+
+    def get_all_pages(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            pages.append(self.parseJsonResponse(response))
+            if response.has_header('Link'):
+                self.assertTrue(response['Link'].endswith('>; rel="next"'))
+                url = response['Link'][1:-len('>; rel="next"')]
+            else:
+                url = None
+        return pages
+
+    def test_cursor_pagination_returns_all_objects_in_order(self):
+        products = [self.create_product(order=order) for order in (2, 1, 2, 0, 1)]
+        expected = sorted(products, key=lambda p: (p.order, p.id))
+
+        pages = self.get_all_pages(reverse('backbone:tests_product'))
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        ids = [item['id'] for page in pages for item in page]
+        self.assertEqual(ids, [p.id for p in expected])
+
+    def test_cursor_pagination_with_only_columns(self):
+        brands = [self.create_brand(name='Brand %s' % i) for i in range(3)]
+
+        pages = self.get_all_pages(reverse('backbone:tests_brand'))
+        self.assertEqual(pages, [
+            [{'id': brands[0].id, 'name': 'Brand 0'}, {'id': brands[1].id, 'name': 'Brand 1'}],
+            [{'id': brands[2].id, 'name': 'Brand 2'}],
+        ])
+
+    def test_cursor_pagination_does_not_count_objects(self):
+        for i in range(3):
+            self.create_product()
+        url = reverse('backbone:tests_product')
+        # One query for the products and one for the prefetched categories.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(self.parseJsonResponse(response)), 2)
+        self.assertTrue(response.has_header('Link'))
+
+    def test_last_page_has_no_link_to_next_page(self):
+        self.create_product()
+        response = self.client.get(reverse('backbone:tests_product'))
+        self.assertEqual(len(self.parseJsonResponse(response)), 1)
+        self.assertFalse(response.has_header('Link'))
+
+    def test_invalid_cursor_returns_error(self):
+        url = reverse('backbone:tests_product')
+        response = self.client.get(url, {'cursor': 'abcd'})
+        self.assertEqual(response.status_code, 400)
+
+
+class StreamingTests(TestHelper):
+
+    def setUp(self):
+        ProductBackboneView.stream_collection = True
+        ProductBackboneView.stream_chunk_size = 2
+        BrandBackboneView.stream_collection = True
+
+    def tearDown(self):
+        del ProductBackboneView.stream_collection
+        del ProductBackboneView.stream_chunk_size
+        del BrandBackboneView.stream_collection
+
+    def parseStreamingJsonResponse(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content).decode('utf-8'))
+
+    def test_streamed_collection_view_returns_all_products_in_order(self):
+        category = self.create_category()
+        products = [self.create_product(order=i) for i in range(3)]
+        for product in products:
+            product.categories.add(category)
+
+        url = reverse('backbone:tests_product')
+        # The products, and the categories prefetched for each of the two chunks.
+        with self.assertNumQueries(3):
+            data = self.parseStreamingJsonResponse(self.client.get(url))
+        self.assertEqual([item['id'] for item in data], [p.id for p in products])
+        self.assertEqual(data[0]['categories'], [category.id])
+        self.assertEqual(data[0]['custom2'], 'custom2: %s' % products[0].name)
+
+    def test_streamed_collection_view_with_no_objects_returns_empty_list(self):
+        url = reverse('backbone:tests_product')
+        data = self.parseStreamingJsonResponse(self.client.get(url))
+        self.assertEqual(data, [])
+
+    def test_streamed_collection_view_with_only_columns(self):
+        brand = self.create_brand(name='A')
+        url = reverse('backbone:tests_brand')
+        data = self.parseStreamingJsonResponse(self.client.get(url))
+        self.assertEqual(data, [{'id': brand.id, 'name': 'A'}])
+
+
+class ConditionalGetTests(TestHelper):
+
+    def setUp(self):
+        ProductBackboneView.last_modified_field = 'modification_date'
+
+    def tearDown(self):
+        del ProductBackboneView.last_modified_field
+
+    def test_collection_view_returns_304_when_etag_matches(self):
+        product = self.create_product()
+        url = reverse('backbone:tests_product')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        # Only the aggregate query is needed
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        product.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        self.create_product()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.parseJsonResponse(response)), 2)
+
+    def test_etag_changes_when_related_objects_change(self):
+        product = self.create_product()
+        category = self.create_category()
+        for url in (reverse('backbone:tests_product'), reverse('backbone:tests_product_detail', args=[product.id])):
+            etag = self.client.get(url)['ETag']
+            product.categories.add(category)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            product.categories.clear()
+
+    def test_collection_view_etag_depends_on_query_parameters(self):
+        self.create_product()
+        url = reverse('backbone:tests_product')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_view_returns_304_when_not_modified_since(self):
+        product = self.create_product()
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        last_modified = response['Last-Modified']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        Product.objects.filter(id=product.id).update(
+            modification_date=product.modification_date + datetime.timedelta(seconds=2)
+        )
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_view_returns_304_when_etag_matches(self):
+        product = self.create_product()
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Product.objects.filter(id=product.id).update(
+            modification_date=product.modification_date + datetime.timedelta(seconds=1)
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_view_for_invalid_id_returns_404(self):
+        url = reverse('backbone:tests_product_detail', args=[999])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_without_last_modified_field_uses_etag_of_content(self):
+        brand = self.create_brand(name='A')
+        url = reverse('backbone:tests_brand_detail', args=[brand.id])
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        brand.name = 'B'
+        brand.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_count_free_pages_use_etag_of_content(self):
+        for i in range(3):
+            self.create_product(name=str(i))
+        url = reverse('backbone:tests_product')
+        ProductBackboneView.paginate_by = 2
+        try:
+            for options in ({'paginate_count': False}, {'cursor_pagination': True}):
+                for option, value in options.items():
+                    setattr(ProductBackboneView, option, value)
+                try:
+                    with CaptureQueriesContext(connection) as queries:
+                        response = self.client.get(url)
+                    self.assertFalse(response.has_header('Last-Modified'))
+                    self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                    self.assertEqual(response.status_code, 304)
+                finally:
+                    for option in options:
+                        delattr(ProductBackboneView, option)
+        finally:
+            del ProductBackboneView.paginate_by
+
+
+class ResponseCacheTests(TestHelper):
+
+    def setUp(self):
+        cache.clear()
+        ProductBackboneView.cache_timeout = 60
+
+    def tearDown(self):
+        del ProductBackboneView.cache_timeout
+
+    def test_registration_tracks_the_models_of_cached_responses(self):
+        tracked = backbone.cache._tracked_models
+        tracked.difference_update([Product, Brand, Category])
+        BackboneSite().register(ProductBackboneView)
+        self.assertTrue(set([Product, Brand, Category]) <= tracked)
+
+    def test_collection_response_is_cached_until_objects_are_changed(self):
+        product = self.create_product(name='A')
+        url = reverse('backbone:tests_product')
+        content = self.client.get(url).content
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.content, content)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        product.name = 'B'
+        product.save()
+        data = self.parseJsonResponse(self.client.get(url))
+        self.assertEqual(data[0]['name'], 'B')
+
+        product.delete()
+        data = self.parseJsonResponse(self.client.get(url))
+        self.assertEqual(data, [])
+
+    def test_cached_response_is_invalidated_by_related_model_changes(self):
+        product = self.create_product()
+        category = self.create_category()
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        self.client.get(url)
+
+        product.categories.add(category)
+        data = self.parseJsonResponse(self.client.get(url))
+        self.assertEqual(data['categories'], [category.id])
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        category.save()
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_cached_responses_depend_on_query_parameters(self):
+        self.create_product()
+        url = reverse('backbone:tests_product')
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.client.get(url, {'foo': 'bar'})
+
+    def test_cached_response_returns_304_when_etag_matches(self):
+        self.create_product()
+        url = reverse('backbone:tests_product')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_responses_are_not_shared_between_users(self):
+        User.objects.create_user(username='test', password='test', email='t@t.com')
+        self.create_product()
+        url = reverse('backbone:tests_product')
+        self.client.get(url)
+        self.client.login(username='test', password='test')
+        with self.assertNumQueries(4):  # Session and user, products and categories
+            self.client.get(url)
+
+
+class CacheInvalidationTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        backbone.cache.track_generations(Product)
+
+    @skipUnless(hasattr(transaction, 'on_commit'), 'Requires Django >= 1.9')
+    def test_model_is_invalidated_again_when_the_transaction_is_committed(self):
+        # A concurrent request could cache the old objects under the generation set on save
+        with transaction.atomic():
+            Product.objects.create(name='A', price='1.00', sku='1')
+            generations = backbone.cache.get_generations([Product])
+        self.assertNotEqual(backbone.cache.get_generations([Product]), generations)
+
+
+class FieldSelectionTests(TestHelper):
+
+    def test_collection_view_returns_only_requested_fields(self):
+        product = self.create_product(name='Foo')
+        url = reverse('backbone:tests_product')
+        response = self.client.get(url, {'fields': 'brand,name'})
+        data = self.parseJsonResponse(response)
+        self.assertEqual(data, [{'id': product.id, 'name': 'Foo', 'brand': product.brand_id}])
+
+    def test_detail_view_returns_only_requested_fields(self):
+        product = self.create_product(sku='123')
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        response = self.client.get(url, {'fields': 'sku,custom2'})
+        data = self.parseJsonResponse(response)
+        self.assertEqual(data, {'id': product.id, 'sku': '#: 123', 'custom2': 'custom2: Test Product'})
+
+    def test_unknown_requested_field_returns_error(self):
+        url = reverse('backbone:tests_product')
+        response = self.client.get(url, {'fields': 'name,sku,is_hidden'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('backbone:tests_brand_alternate'), {'fields': 'name'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_fields_that_are_not_requested_are_not_loaded(self):
+        product = self.create_product()
+        product.categories.add(self.create_category())
+        url = reverse('backbone:tests_product')
+        with self.assertNumQueries(1):
+            self.client.get(url, {'fields': 'name'})
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.parseJsonResponse(self.client.get(url, {'fields': 'name,categories'}))
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"name"', queries[0]['sql'])
+        self.assertNotIn('"sku"', queries[0]['sql'])
+        self.assertEqual(len(data[0]['categories']), 1)
+
+
+class OrderingTests(TestHelper):
+
+    def setUp(self):
+        ProductBackboneView.ordering_fields = ['price', 'name']
+        BrandBackboneView.ordering_fields = ['name']
+        self.products = [
+            self.create_product(name=name, price=price, brand=None)
+            for name, price in (('B', '3.00'), ('A', '1.00'), ('C', '3.00'), ('D', '2.00'))
+        ]
+
+    def tearDown(self):
+        del ProductBackboneView.ordering_fields
+        del BrandBackboneView.ordering_fields
+
+    def get_names(self, url, params):
+        return [item['name'] for item in self.parseJsonResponse(self.client.get(url, params))]
+
+    def test_collection_view_uses_requested_ordering_with_pk_tiebreaker(self):
+        url = reverse('backbone:tests_product')
+        self.assertEqual(self.get_names(url, {'ordering': 'price'}), ['A', 'D', 'B', 'C'])
+        self.assertEqual(self.get_names(url, {'ordering': '-price'}), ['B', 'C', 'D', 'A'])
+        self.assertEqual(self.get_names(url, {'ordering': '-price,-name'}), ['C', 'B', 'D', 'A'])
+        self.assertEqual(self.get_names(url, {'ordering': '-id'}), ['D', 'C', 'A', 'B'])
+
+    def test_ordering_by_field_that_is_not_allowed_returns_error(self):
+        url = reverse('backbone:tests_product')
+        for ordering in ('sku', '-sku', 'price,sku', 'brand__name', '--price', 'price,--name'):
+            response = self.client.get(url, {'ordering': ordering})
+            self.assertEqual(response.status_code, 400)
+
+    def test_requested_ordering_is_used_for_pages(self):
+        for name in ('A', 'C', 'B'):
+            self.create_brand(name=name)
+        url = reverse('backbone:tests_brand')
+        response = self.client.get(url, {'ordering': '-name'})
+        self.assertEqual([item['name'] for item in self.parseJsonResponse(response)], ['C', 'B'])
+        self.assertIn('ordering=-name', response['Link'])
+        response = self.client.get(url, {'ordering': '-name', 'page': 2})
+        self.assertEqual([item['name'] for item in self.parseJsonResponse(response)], ['A'])
+
+    def test_requested_ordering_is_used_for_cursor_pages(self):
+        ProductBackboneView.paginate_by = 3
+        ProductBackboneView.cursor_pagination = True
+        try:
+            url = reverse('backbone:tests_product')
+            for params in ({'ordering': '-price'}, {'ordering': '-price', 'fields': 'name'}):
+                response = self.client.get(url, params)
+                self.assertEqual([item['name'] for item in self.parseJsonResponse(response)], ['B', 'C', 'D'])
+                next_url = response['Link'][1:-len('>; rel="next"')]
+                self.assertEqual(self.get_names(next_url, {}), ['A'])
+
+            # A cursor can't be used with another ordering
+            cursor = self.client.get(url, {'ordering': '-price'})['Link'].split('cursor=')[1].split('&')[0]
+            response = self.client.get(url, {'ordering': 'price', 'cursor': cursor})
+            self.assertEqual(response.status_code, 400)
+        finally:
+            del ProductBackboneView.paginate_by
+            del ProductBackboneView.cursor_pagination
+
+    def test_cursor_pages_cannot_be_ordered_by_nullable_fields_or_relations(self):
+        ProductBackboneView.ordering_fields = ['price', 'sale_date', 'brand__name']
+        ProductBackboneView.paginate_by = 3
+        ProductBackboneView.cursor_pagination = True
+        try:
+            url = reverse('backbone:tests_product')
+            for ordering in ('sale_date', '-brand__name'):
+                response = self.client.get(url, {'ordering': ordering})
+                self.assertEqual(response.status_code, 400)
+            del ProductBackboneView.cursor_pagination
+            self.assertEqual(self.client.get(url, {'ordering': 'brand__name'}).status_code, 200)
+        finally:
+            del ProductBackboneView.paginate_by
+            if 'cursor_pagination' in ProductBackboneView.__dict__:
+                del ProductBackboneView.cursor_pagination
+
+
+class FilterTests(TestHelper):
+
+    def setUp(self):
+        ProductBackboneView.filter_fields = {
+            'brand': ['exact', 'in'],
+            'price': ['gte', 'lte', 'range'],
+            'sale_date': ['isnull'],
+            'is_hidden': ['exact'],
+        }
+        self.brand = self.create_brand()
+        self.p1 = self.create_product(name='A', price='5.00', brand=self.brand)
+        self.p2 = self.create_product(name='B', price='10.00', sale_date=datetime.datetime(2014, 1, 1))
+        self.p3 = self.create_product(name='C', price='15.00', brand=None)
+
+    def tearDown(self):
+        del ProductBackboneView.filter_fields
+
+    def get_names(self, params):
+        url = reverse('backbone:tests_product')
+        return [item['name'] for item in self.parseJsonResponse(self.client.get(url, params))]
+
+    def test_collection_view_filters_by_allowed_lookups(self):
+        self.assertEqual(self.get_names({'brand': self.brand.id}), ['A'])
+        self.assertEqual(self.get_names({'brand__in': '%s,%s' % (self.brand.id, self.p2.brand_id)}), ['A', 'B'])
+        self.assertEqual(self.get_names({'price__gte': '10'}), ['B', 'C'])
+        self.assertEqual(self.get_names({'price__gte': '6', 'price__lte': '12.50'}), ['B'])
+        self.assertEqual(self.get_names({'price__range': '4,10'}), ['A', 'B'])
+        self.assertEqual(self.get_names({'sale_date__isnull': 'false'}), ['B'])
+        self.assertEqual(self.get_names({'sale_date__isnull': 'true'}), ['A', 'C'])
+        self.assertEqual(self.get_names({'is_hidden': 'false'}), ['A', 'B', 'C'])
+        self.assertEqual(self.get_names({'is_hidden': 'True'}), [])
+
+    def test_collection_view_ignores_parameters_that_are_not_allowed(self):
+        self.assertEqual(self.get_names({'name': 'A', 'price': '5.00', 'price__gt': 10}), ['A', 'B', 'C'])
+
+    def test_collection_view_still_applies_queryset_restrictions(self):
+        self.create_product(name='D', price='20.00', is_hidden=True)
+        self.assertEqual(self.get_names({'price__gte': '15'}), ['C'])
+
+    def test_invalid_filter_value_returns_error(self):
+        url = reverse('backbone:tests_product')
+        for params in (
+            {'brand': 'x'}, {'price__gte': 'abc'}, {'price__range': '1,2,3'}, {'sale_date__isnull': 'maybe'},
+            {'is_hidden': 't'}
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(list(params)[0], response.content.decode('utf-8'))
+
+
+class BatchTests(TestHelper):
+
+    def setUp(self):
+        self.url = reverse('backbone:batch')
+
+    def post_batch(self, requests, status_code=200):
+        response = self.client.post(self.url, json.dumps(requests), content_type='application/json')
+        return self.parseJsonResponse(response, status_code=status_code)
+
+    def test_batch_returns_responses_of_all_requests_in_order(self):
+        product = self.create_product(name='Foo')
+        data = self.post_batch([
+            {'method': 'GET', 'path': reverse('backbone:tests_product_detail', args=[product.id])},
+            {'path': reverse('backbone:tests_brand') + '?page=2'},
+            {'path': reverse('backbone:tests_product_detail', args=[product.id + 1])},
+            {'path': reverse('tests-homepage')},
+        ])
+        self.assertEqual([item['status'] for item in data], [200, 400, 404, 404])
+        self.assertEqual(data[0]['body']['name'], 'Foo')
+        self.assertIn('ETag', data[0]['headers'])
+        self.assertEqual(data[1]['body'], _('Invalid `page` parameter: Out of range.'))
+
+    def test_batch_requests_are_made_by_the_same_user_in_order(self):
+        user = User.objects.create_user(username='test', password='test', email='t@t.com')
+        user.user_permissions.add(Permission.objects.get_by_natural_key('add_product', 'tests', 'product'))
+        product = {'name': 'Foo', 'price': 1, 'order': 1}
+        requests = [
+            {'method': 'POST', 'path': reverse('backbone:tests_product'), 'body': product},
+            {'method': 'GET', 'path': reverse('backbone:tests_product')},
+        ]
+        data = self.post_batch(requests)
+        self.assertEqual([item['status'] for item in data], [403, 200])
+        self.assertEqual(data[1]['body'], [])
+
+        self.client.login(username='test', password='test')
+        data = self.post_batch(requests)
+        self.assertEqual([item['status'] for item in data], [201, 200])
+        self.assertTrue(data[0]['headers']['Location'].endswith(
+            reverse('backbone:tests_product_detail', args=[data[0]['body']['id']])
+        ))
+        self.assertEqual([item['name'] for item in data[1]['body']], ['Foo'])
+
+    def test_invalid_batch_returns_error(self):
+        for requests in ({'path': '/'}, [{'method': 'GET'}], [{'method': 'OPTIONS', 'path': '/'}]):
+            response = self.client.post(self.url, json.dumps(requests), content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_batch_cannot_request_change_feeds(self):
+        requests = [{'path': reverse('backbone:tests_product_sync_events')}]
+        response = self.client.post(self.url, json.dumps(requests), content_type='application/json')
+        data = json.loads(response.content)
+        self.assertEqual(data[0]['status'], 400)
+
+    def test_batch_cannot_request_event_streams(self):
+        def get_collection(self, request, **kwargs):
+            return StreamingHttpResponse(itertools.repeat(': keep-alive\n\n'), content_type='text/event-stream')
+
+        ProductBackboneView.get_collection = get_collection
+        try:
+            requests = [{'path': reverse('backbone:tests_product')}]
+            response = self.client.post(self.url, json.dumps(requests), content_type='application/json')
+        finally:
+            del ProductBackboneView.get_collection
+        self.assertEqual(json.loads(response.content)[0]['status'], 400)
+
+    def test_batch_with_too_many_requests_returns_error(self):
+        requests = [{'path': reverse('backbone:tests_product')}] * (backbone.site.max_batch_requests + 1)
+        response = self.client.post(self.url, json.dumps(requests), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnlessDBFeature('test_db_allows_multiple_connections')
+class ConcurrentBatchTests(TransactionTestCase):
+
+    def setUp(self):
+        backbone.site.batch_threads = 4
+
+    def tearDown(self):
+        del backbone.site.batch_threads
+
+    def test_batch_of_get_requests_is_handled_concurrently(self):
+        brand = Brand.objects.create(name='Foo')
+        requests = [
+            {'path': reverse('backbone:tests_brand_alternate_detail', args=[brand.id])} for i in range(8)
+        ]
+        response = self.client.post(reverse('backbone:batch'), json.dumps(requests), content_type='application/json')
+        data = json.loads(response.content)
+        self.assertEqual([item['status'] for item in data], [200] * 8)
+        self.assertEqual(data[0]['body'], {'id': brand.id, 'custom': 'foo'})
+
+    def test_batch_threads_use_the_language_and_urlconf_of_the_request(self):
+        def get_collection(self, request, **kwargs):
+            return HttpResponse(json.dumps([translation.get_language(), get_urlconf()]), content_type='application/json')
+
+        ProductBackboneView.get_collection = get_collection
+        try:
+            requests = [{'path': reverse('backbone:tests_product')}] * 2
+            with translation.override('fr'):
+                response = self.client.post(
+                    reverse('backbone:batch'), json.dumps(requests), content_type='application/json'
+                )
+        finally:
+            del ProductBackboneView.get_collection
+        data = json.loads(response.content)
+        self.assertEqual([item['body'] for item in data], [['fr', settings.ROOT_URLCONF]] * 2)
+
+
+class DispatchTableTests(TestHelper):
+
+    def test_urls_are_reversed_by_name(self):
+        self.assertEqual(reverse('backbone_dispatch:tests_product'), '/backbone-dispatch/tests/product')
+        self.assertEqual(reverse('backbone_dispatch:tests_brand_detail', args=[1]), '/backbone-dispatch/tests/brand/1')
+
+    def test_urls_are_resolved_by_the_dispatch_view(self):
+        dispatch_site = resolve('/backbone-dispatch/tests/product').func.__self__
+        self.assertTrue(dispatch_site.dispatch_table)
+        match = resolve('/backbone-dispatch/tests/product/1')
+        self.assertEqual(match.func, dispatch_site.dispatch_view)
+        self.assertEqual(match.kwargs, {'app_label': 'tests', 'url_slug': 'product', 'id': '1'})
+
+    def test_collection_and_detail_views_are_dispatched(self):
+        product = self.create_product(name='Foo')
+        response = self.client.get(reverse('backbone_dispatch:tests_product'))
+        self.assertEqual([item['id'] for item in self.parseJsonResponse(response)], [product.id])
+        response = self.client.get(reverse('backbone_dispatch:tests_product_detail', args=[product.id]))
+        self.assertEqual(self.parseJsonResponse(response)['name'], 'Foo')
+        response = self.client.get(reverse('backbone_dispatch:tests_product_detail', args=[product.id + 1]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_urls_of_views_that_are_not_registered_return_404(self):
+        for url in ('/backbone-dispatch/tests/extendedproduct', '/backbone-dispatch/foo/product/1'):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_unregistered_view_is_replaced_by_the_next_view_with_the_same_url(self):
+        class OtherProductBackboneView(ProductBackboneView):
+            display_fields = ['name']
+
+        self.create_product()
+        site = BackboneSite()
+        site.dispatch_table = True
+        site.register(ProductBackboneView)
+        site.register(OtherProductBackboneView)
+        request = RequestFactory().get('/tests/product')
+        self.assertIn(b'brand', site.dispatch_view(request, 'tests', 'product').content)
+        site.unregister(ProductBackboneView)
+        self.assertNotIn(b'brand', site.dispatch_view(request, 'tests', 'product').content)
+        site.unregister(OtherProductBackboneView)
+        self.assertRaises(Http404, site.dispatch_view, request, 'tests', 'product')
+
+
+class IncludeTests(TestHelper):
+
+    def setUp(self):
+        ProductBackboneView.include_fields = ['brand', 'categories']
+        self.brand = self.create_brand(name='Foo')
+        self.categories = [self.create_category(name='A'), self.create_category(name='B')]
+        self.products = [self.create_product(brand=self.brand) for i in range(3)]
+        self.products[0].categories = self.categories
+
+    def tearDown(self):
+        del ProductBackboneView.include_fields
+
+    def test_collection_view_includes_related_objects(self):
+        url = reverse('backbone:tests_product')
+        # Products, brands and categories
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'include': 'brand,categories'})
+        data = self.parseJsonResponse(response)
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]['brand'], {'id': self.brand.id, 'name': 'Foo'})
+        self.assertEqual(data[0]['categories'], [
+            {'id': self.categories[0].id, 'name': 'A'}, {'id': self.categories[1].id, 'name': 'B'}
+        ])
+        self.assertEqual(data[1]['categories'], [])
+
+        data = self.parseJsonResponse(self.client.get(url, {'include': 'brand', 'fields': 'brand'}))
+        self.assertEqual(data[0], {'id': self.products[0].id, 'brand': {'id': self.brand.id, 'name': 'Foo'}})
+
+    def test_detail_view_includes_related_objects(self):
+        product = self.create_product(brand=None)
+        url = reverse('backbone:tests_product_detail', args=[product.id])
+        data = self.parseJsonResponse(self.client.get(url, {'include': 'brand'}))
+        self.assertEqual(data['brand'], None)
+        self.assertEqual(data['categories'], [])
+
+        url = reverse('backbone:tests_product_detail', args=[self.products[0].id])
+        data = self.parseJsonResponse(self.client.get(url, {'include': 'categories'}))
+        self.assertEqual(data['brand'], self.brand.id)
+        self.assertEqual([item['name'] for item in data['categories']], ['A', 'B'])
+
+    def test_relations_that_are_not_allowed_or_not_displayed_cannot_be_included(self):
+        url = reverse('backbone:tests_product')
+        for params in ({'include': 'sku'}, {'include': 'name'}, {'include': 'brand', 'fields': 'name'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('backbone:tests_brand'), {'include': 'name'})
+        self.assertEqual(response.status_code, 400)
+
+
+class DeltaSyncTests(TestHelper):
+
+    def setUp(self):
+        SyncProductBackboneView.delta_sync_margin = 0
+        self.url = reverse('backbone:tests_product_sync')
+
+    def tearDown(self):
+        del SyncProductBackboneView.delta_sync_margin
+
+    def sync(self, token):
+        return self.parseJsonResponse(self.client.get(self.url, {'since': token}))
+
+    def test_sync_returns_changes_and_deletions_since_token(self):
+        p1 = self.create_product(name='A')
+        p2 = self.create_product(name='B')
+        p3 = self.create_product(name='C')
+
+        data = self.sync('')
+        self.assertEqual([item['name'] for item in data['changed']], ['A', 'B', 'C'])
+        self.assertEqual(data['deleted'], [])
+
+        p1.name = 'A2'
+        p1.save()
+        p2_id = p2.id
+        p2.delete()
+        self.create_product(name='D')
+        data = self.sync(data['since'])
+        self.assertEqual([item['name'] for item in data['changed']], ['A2', 'D'])
+        self.assertEqual(data['deleted'], [p2_id])
+
+        p3.categories.add(self.create_category())  # Doesn't change the modification date
+        data = self.sync(data['since'])
+        self.assertEqual(data['changed'], [])
+        self.assertEqual(data['deleted'], [])
+
+    def test_deletions_are_recorded_as_tombstones(self):
+        product = self.create_product()
+        product_id = product.id
+        data = self.sync('')
+        product.delete()
+        self.assertEqual(Tombstone.objects.get().object_id, str(product_id))
+        self.assertEqual(self.sync(data['since'])['deleted'], [product_id])
+
+    def test_objects_changed_out_of_the_queryset_are_deleted(self):
+        product = self.create_product()
+        data = self.sync('')
+        product.is_hidden = True
+        product.save()
+        data = self.sync(data['since'])
+        self.assertEqual(data['changed'], [])
+        self.assertEqual(data['deleted'], [product.id])
+
+    def test_sync_tokens_overlap_by_the_margin(self):
+        del SyncProductBackboneView.delta_sync_margin
+        product = self.create_product(name='A')
+        data = self.sync('')
+        # The product could have been committed after the token was taken
+        self.assertEqual([item['id'] for item in self.sync(data['since'])['changed']], [product.id])
+        SyncProductBackboneView.delta_sync_margin = 0
+
+    def test_invalid_token_returns_error(self):
+        for token in ('abcd', signing.dumps('abcd', salt='backbone.sync')):
+            response = self.client.get(self.url, {'since': token})
+            self.assertEqual(response.status_code, 400)
+
+    def test_token_older_than_tombstone_retention_returns_error(self):
+        with self.settings(BACKBONE_TOMBSTONE_RETENTION=60):
+            response = self.client.get(self.url, {'since': get_sync_token(margin=30)})
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(self.url, {'since': get_sync_token(margin=90)})
+            self.assertEqual(response.status_code, 400)
+
+    def test_tombstones_older_than_retention_are_pruned(self):
+        now = timezone.now()
+        Tombstone.objects.create(model='tests.product', object_id='1', deletion_date=now - datetime.timedelta(days=2))
+        Tombstone.objects.create(model='tests.product', object_id='2', deletion_date=now)
+        with self.settings(BACKBONE_TOMBSTONE_RETENTION=24 * 60 * 60):
+            call_command('prune_tombstones', verbosity=0)
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), ['2'])
+
+    def test_since_parameter_is_ignored_without_delta_sync(self):
+        self.create_product()
+        response = self.client.get(reverse('backbone:tests_product'), {'since': ''})
+        self.assertEqual(len(self.parseJsonResponse(response)), 1)
+
+
+class ChangeFeedTests(TransactionTestCase):
+    # The changes are published once their transaction is committed
+
+    def setUp(self):
+        SyncProductBackboneView.change_feed_keepalive = 0.01
+        self.response = self.client.get(reverse('backbone:tests_product_sync_events'))
+        self.content = iter(self.response.streaming_content)
+
+    def tearDown(self):
+        self.response.close()
+        del SyncProductBackboneView.change_feed_keepalive
+
+    def read_event(self):
+        for chunk in self.content:
+            if not chunk.startswith(b':'):
+                event, data = chunk.decode('utf-8').strip().split('\n')
+                return event[len('event: '):], json.loads(data[len('data: '):])
+
+    def test_changes_are_streamed_as_events(self):
+        self.assertEqual(self.response['Content-Type'], 'text/event-stream')
+        self.assertEqual(next(self.content), b': connected\n\n')
+
+        product = Product.objects.create(name='Foo', price='1.00', sku='1')
+        event, data = self.read_event()
+        self.assertEqual(event, 'created')
+        self.assertEqual(data, {'id': product.id, 'name': 'Foo', 'brand': None, 'categories': []})
+
+        product.name = 'Bar'
+        product.save()
+        self.assertEqual(self.read_event(), ('updated', {
+            'id': product.id, 'name': 'Bar', 'brand': None, 'categories': []
+        }))
+
+        product_id = product.id
+        product.delete()
+        self.assertEqual(self.read_event(), ('deleted', {'id': product_id}))
+
+    def test_objects_out_of_the_queryset_are_not_streamed(self):
+        next(self.content)
+        Product.objects.create(name='Foo', price='1.00', sku='1', is_hidden=True)
+        product = Product.objects.create(name='Bar', price='1.00', sku='2')
+        # The creation of the hidden product isn't sent
+        self.assertEqual(self.read_event(), ('created', {
+            'id': product.id, 'name': 'Bar', 'brand': None, 'categories': []
+        }))
+        product.is_hidden = True
+        product.save()
+        self.assertEqual(self.read_event(), ('deleted', {'id': product.id}))
+
+    @skipUnlessDBFeature('can_return_ids_from_bulk_insert')
+    def test_bulk_added_objects_are_streamed(self):
+        user = User.objects.create_user(username='test', password='test', email='t@t.com')
+        user.user_permissions = [Permission.objects.get_by_natural_key('add_product', 'tests', 'product')]
+        self.client.login(username='test', password='test')
+        next(self.content)
+        data = json.dumps([{'name': name, 'price': 1, 'order': 1} for name in ('A', 'B')])
+        response = self.client.post(reverse('backbone:tests_product'), data, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([self.read_event()[1]['name'] for i in range(2)], ['A', 'B'])
+
+    def test_keepalive_is_sent_without_changes(self):
+        next(self.content)
+        self.assertEqual(next(self.content), b': keep-alive\n\n')
+
+    def test_feed_unsubscribes_when_closed(self):
+        next(self.content)
+        channel = get_channel(Product)
+        self.assertEqual(len(get_broker().subscribers[channel]), 1)
+        self.response.close()
+        self.assertEqual(len(get_broker().subscribers[channel]), 0)
+
+    def test_views_without_change_feed_have_no_events_url(self):
+        self.assertEqual(self.client.get('/backbone/tests/product/events').status_code, 404)
+
+
+class ReadDatabaseTests(TestHelper):
+    multi_db = True
+
+    def setUp(self):
+        ProductBackboneView.read_database = 'replica'
+        self.user = User.objects.create_user(username='test', password='test', email='t@t.com')
+        self.client.login(username='test', password='test')
+        self.user.user_permissions = [Permission.objects.get_by_natural_key('add_product', 'tests', 'product')]
+        # The databases aren't actually replicated in the tests
+        self.product = self.create_product(name='Primary', brand=None)
+        self.replica_product = Product.objects.using('replica').create(name='Replica', price='1.00', sku='1')
+
+    def tearDown(self):
+        del ProductBackboneView.read_database
+
+    def get_names(self):
+        response = self.client.get(reverse('backbone:tests_product'))
+        return [item['name'] for item in self.parseJsonResponse(response)]
+
+    def test_get_requests_read_from_read_database(self):
+        self.assertEqual(self.get_names(), ['Replica'])
+        url = reverse('backbone:tests_product_detail', args=[self.replica_product.id])
+        self.assertEqual(self.parseJsonResponse(self.client.get(url))['name'], 'Replica')
+
+    def test_writes_go_to_default_database_and_following_reads_stick_to_it(self):
+        data = json.dumps({'name': 'New', 'brand': None, 'price': 1, 'order': 1})
+        response = self.client.post(reverse('backbone:tests_product'), data, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.cookies['backbone_sticky']['max-age'], 5)
+        self.assertEqual(Product.objects.filter(name='New').count(), 1)
+        self.assertEqual(Product.objects.using('replica').filter(name='New').count(), 0)
+        self.assertEqual(self.get_names(), ['Primary', 'New'])
+
+        del self.client.cookies['backbone_sticky']
+        self.assertEqual(self.get_names(), ['Replica'])
+
+    def test_failed_writes_do_not_stick_to_default_database(self):
+        data = json.dumps({'name': ''})
+        response = self.client.post(reverse('backbone:tests_product'), data, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('backbone_sticky', response.cookies)
+        self.assertEqual(self.get_names(), ['Replica'])
+
+    def test_batch_reads_after_writes_stick_to_default_database(self):
+        url = reverse('backbone:tests_product')
+        requests = [
+            {'method': 'GET', 'path': url},
+            {'method': 'POST', 'path': url, 'body': {'name': 'New', 'brand': None, 'price': 1, 'order': 1}},
+            {'method': 'GET', 'path': url},
+        ]
+        response = self.client.post(reverse('backbone:batch'), json.dumps(requests), content_type='application/json')
+        data = json.loads(response.content)
+        self.assertEqual([item['name'] for item in data[0]['body']], ['Replica'])
+        self.assertEqual([item['name'] for item in data[2]['body']], ['Primary', 'New'])
+        self.assertIn('backbone_sticky', response.cookies)
+
+    def test_cached_responses_are_filled_from_default_database_and_skipped_when_sticky(self):
+        ProductBackboneView.cache_timeout = 60
+        try:
+            cache.clear()
+            self.assertEqual(self.get_names(), ['Primary'])
+            Product.objects.filter(pk=self.product.pk).update(name='Changed')  # Doesn't invalidate the cache
+            self.assertEqual(self.get_names(), ['Primary'])
+            self.client.cookies['backbone_sticky'] = '1'
+            self.assertEqual(self.get_names(), ['Changed'])
+        finally:
+            del ProductBackboneView.cache_timeout
+
+    def test_get_requests_read_from_default_database_without_read_database(self):
+        del ProductBackboneView.read_database
+        self.assertEqual(self.get_names(), ['Primary'])
+        ProductBackboneView.read_database = 'replica'
+
+
+class AnnotatedFieldsTests(TestHelper):
+
+    def setUp(self):
+        self.categories = [self.create_category(), self.create_category()]
+        self.cheap = self.create_product(name='Cheap', price='5.00', brand=None)
+        self.cheap.categories = reversed(self.categories)
+        self.expensive = self.create_product(name='Expensive', price='20.00', brand=None)
+
+    def test_annotated_fields_match_the_model_methods(self):
+        fields = ['name', 'is_priced_under_10', 'get_first_category_id']
+        url = reverse('backbone:tests_product')
+        expected = self.parseJsonResponse(self.client.get(url, {'fields': ','.join(fields)}))
+        url = reverse('backbone:tests_product_annotated')
+        data = self.parseJsonResponse(self.client.get(url, {'fields': ','.join(fields)}))
+        self.assertEqual(data, expected)
+        self.assertEqual(data[0]['is_priced_under_10'], True)
+        self.assertEqual(data[0]['get_first_category_id'], self.categories[0].id)
+        self.assertEqual(data[1]['get_first_category_id'], None)
+
+    def test_collection_annotated_fields_are_computed_in_a_single_query(self):
+        url = reverse('backbone:tests_product_annotated')
+        with self.assertNumQueries(1):
+            data = self.parseJsonResponse(self.client.get(url))
+        self.assertEqual(data[1], {
+            'id': self.expensive.id, 'name': 'Expensive', 'price': '20.00',
+            'is_priced_under_10': False, 'get_first_category_id': None
+        })
+
+    def test_detail_annotated_fields_are_computed_in_a_single_query(self):
+        url = reverse('backbone:tests_product_annotated_detail', args=[self.cheap.id])
+        with self.assertNumQueries(1):
+            data = self.parseJsonResponse(self.client.get(url))
+        self.assertEqual(data['is_priced_under_10'], True)
+        self.assertEqual(data['get_first_category_id'], self.categories[0].id)
+
+    def test_annotated_fields_of_saved_objects_are_loaded(self):
+        user = User.objects.create_user(username='test', password='test', email='t@t.com')
+        user.user_permissions = [Permission.objects.get_by_natural_key('add_product', 'tests', 'product')]
+        self.client.login(username='test', password='test')
+        data = json.dumps({'name': 'New', 'price': 1, 'order': 1, 'categories': [self.categories[1].id]})
+        response = self.client.post(reverse('backbone:tests_product_annotated'), data, content_type='application/json')
+        data = self.parseJsonResponse(response, status_code=201)
+        self.assertEqual(data['is_priced_under_10'], True)
+        self.assertEqual(data['get_first_category_id'], self.categories[1].id)
+
+    def test_models_referenced_by_annotated_fields_are_cache_dependencies(self):
+        view = AnnotatedProductBackboneView()
+        self.assertEqual(view.get_cache_dependencies(view.display_fields), [Product, Category])
+
+
+class JSONBackendTests(TestHelper):
+
+    def setUp(self):
+        self.data = [{
+            'id': 1,
+            'name': 'Caf\xe9',
+            'price': Decimal('12.30'),
+            'creation_date': datetime.datetime(2016, 10, 25, 14, 30, 59, 123456),
+            'sale_date': datetime.date(2016, 10, 25),
+            'uuid': uuid.UUID(int=1),
+            'categories': [1, 2],
+            'brand': None,
+        }]
+        BrandBackboneView.json_pretty = None
+
+    def tearDown(self):
+        del BrandBackboneView.json_pretty
+
+    def test_backends_encode_special_types_identically(self):
+        reference = JSONBackend().dumps(self.data, sort_keys=True)
+        self.assertEqual(json.loads(reference)[0]['price'], '12.30')
+        self.assertEqual(json.loads(reference)[0]['creation_date'], '2016-10-25T14:30:59.123')
+        for name in BACKENDS:
+            backend = get_json_backend(name)
+            if type(backend) is JSONBackend and name != 'json':
+                continue  # Not installed
+            self.assertEqual(backend.dumps(self.data, sort_keys=True), reference)
+            self.assertEqual(
+                json.loads(backend.dumps(self.data, sort_keys=True, indent=2)), json.loads(reference)
+            )
+
+    def test_backend_that_is_not_installed_falls_back_to_json(self):
+        backend = get_json_backend('orjson')
+        try:
+            import orjson  # noqa
+        except ImportError:
+            self.assertEqual(type(backend), JSONBackend)
+        else:
+            self.assertEqual(backend.name, 'orjson')
+
+    def test_response_is_compact_by_default(self):
+        self.create_brand(name='A')
+        response = self.client.get(reverse('backbone:tests_brand'))
+        self.assertTrue(b'\n' not in response.content)
+        self.assertTrue(b', ' not in response.content and b': ' not in response.content)
+
+    def test_response_is_indented_when_pretty(self):
+        BrandBackboneView.json_pretty = True
+        self.create_brand(name='A')
+        response = self.client.get(reverse('backbone:tests_brand'))
+        self.assertTrue(b'\n  {\n    "id": ' in response.content)
+
+
+class FieldPlanTests(TestHelper):
+
+    def test_field_plan_is_compiled_once_per_view_class_and_list_of_fields(self):
+        fields = ['id'] + list(ProductBackboneView.display_fields)
+        plan = ProductBackboneView().get_field_plan(fields)
+        self.assertTrue(ProductBackboneView().get_field_plan(list(fields)) is plan)
+        self.assertFalse(ProductBackboneView().get_field_plan(['id', 'name']) is plan)
+        self.assertFalse(BrandBackboneView().get_field_plan(['id', 'name']) is plan)
+
+    def test_field_plan_resolves_the_type_of_each_field(self):
+        fields = ['id'] + list(ProductBackboneView.display_fields)
+        plan = ProductBackboneView().get_field_plan(fields)
+        kinds = dict((accessor.key, accessor.kind) for accessor in plan.accessors)
+        self.assertEqual(kinds, {
+            'id': 'pk',
+            'creation_date': 'column',
+            'name': 'column',
+            'brand': 'fk',
+            'categories': 'm2m',
+            'price': 'column',
+            'order': 'column',
+            'is_priced_under_10': 'property',
+            'get_first_category_id': 'model_method',
+            'sku': 'callable',
+            'custom2': 'view_method',
+        })
+
+    def test_field_plan_loads_what_callable_fields_read(self):
+        fields = ['id'] + list(ProductBackboneView.display_fields)
+        plan = ProductBackboneView().get_field_plan(fields)
+        self.assertEqual(plan.only_fields, ['id', 'creation_date', 'name', 'brand', 'price', 'order', 'sku'])
+        self.assertEqual(plan.prefetch_related, ['categories'])
+
+        class TitleProductBackboneView(ProductBackboneView):
+            display_fields = ['name', 'title']
+
+            @display_field(only=['name'], select_related=['brand'])
+            def title(self, obj):
+                return '%s (%s)' % (obj.name, obj.brand.name if obj.brand else '-')
+
+        plan = TitleProductBackboneView().get_field_plan(['id', 'name', 'title'])
+        self.assertEqual(plan.only_fields, ['id', 'name', 'brand'])
+        self.assertEqual(plan.select_related, ['brand'])
+        self.assertEqual(plan.related_models, [Brand])
+
+        for i in range(3):
+            self.create_product(name='P%d' % i, brand=self.create_brand(name='B%d' % i))
+        view = TitleProductBackboneView()
+        fields = ['id', 'name', 'title']
+        qs = view.optimize_queryset(view.queryset(RequestFactory().get('/')), fields)
+        with CaptureQueriesContext(connection) as queries:
+            data = view.serialize_queryset(qs, fields)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"sku"', queries[0]['sql'])
+        self.assertEqual([item['title'] for item in data], ['P0 (B0)', 'P1 (B1)', 'P2 (B2)'])
+
+    def test_fields_without_hints_load_all_columns(self):
+        plan = ExtendedProductBackboneView().get_field_plan(['id'] + list(ExtendedProductBackboneView.display_fields))
+        self.assertEqual(plan.only_fields, None)
+
+
+class ValuesSerializationTests(TestHelper):
+
+    def setUp(self):
+        self.initialized = []
+        post_init.connect(self.record_init, sender=Brand)
+
+    def tearDown(self):
+        post_init.disconnect(self.record_init, sender=Brand)
+
+    def record_init(self, sender, instance, **kwargs):
+        self.initialized.append(instance)
+
+    def test_field_plan_with_only_columns_is_read_with_values(self):
+        plan = BrandBackboneView().get_field_plan(['id', 'name'])
+        self.assertEqual(plan.values_fields, ['id', 'name'])
+        plan = ProductBackboneView().get_field_plan(['id', 'name', 'brand', 'price'])
+        self.assertEqual(plan.values_fields, ['id', 'name', 'brand', 'price'])
+        plan = ProductBackboneView().get_field_plan(['id', 'name', 'custom2'])
+        self.assertEqual(plan.values_fields, None)
+
+    def test_collection_view_with_only_columns_does_not_create_model_instances(self):
+        b1 = self.create_brand(name='A')
+        b2 = self.create_brand(name='B')
+        self.initialized = []
+
+        url = reverse('backbone:tests_brand')
+        response = self.client.get(url)
+        data = self.parseJsonResponse(response)
+        self.assertEqual(data, [{'id': b1.id, 'name': 'A'}, {'id': b2.id, 'name': 'B'}])
+        self.assertEqual(self.initialized, [])
+
+    def test_detail_view_with_only_columns_does_not_create_model_instances(self):
+        brand = self.create_brand(name='A')
+        self.initialized = []
+
+        url = reverse('backbone:tests_brand_detail', args=[brand.id])
+        response = self.client.get(url)
+        data = self.parseJsonResponse(response)
+        self.assertEqual(data, {'id': brand.id, 'name': 'A'})
+        self.assertEqual(self.initialized, [])
+
+    def test_detail_view_with_only_columns_returns_404_for_invalid_id(self):
+        url = reverse('backbone:tests_brand_detail', args=[999])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+
 class InvalidViewTests(TestHelper):
     def setUp(self):
         BrandBackboneView.display_fields += ['invalid_field']
@@ -4,14 +4,23 @@ from django.conf.urls import url, include
 from django.contrib import admin
 
 import backbone
+from backbone.sites import BackboneSite
 
 admin.autodiscover()
 backbone.autodiscover()
+backbone.site.batch_requests = True
 
+from backbone.tests.backbone_api import BrandBackboneView, ProductBackboneView
 from backbone.tests.views import homepage
 
+dispatch_site = BackboneSite(name='backbone_dispatch')
+dispatch_site.dispatch_table = True
+dispatch_site.register(ProductBackboneView)
+dispatch_site.register(BrandBackboneView)
+
 urlpatterns = [
     url(r'^admin/', include(admin.site.urls)),
     url(r'^backbone/', include(backbone.site.urls)),
+    url(r'^backbone-dispatch/', include(dispatch_site.urls)),
     url(r'^$', homepage, name='tests-homepage'),
 ]
@@ -0,0 +1,19 @@
+from __future__ import unicode_literals
+
+
+def get_model_label(model):
+    """
+    Returns the label (``app_label.modelname``) of the concrete model of the given model, as
+    used to identify it in cache keys, event channels and tombstones.
+    """
+    opts = model._meta.concrete_model._meta
+    return '%s.%s' % (opts.app_label, opts.object_name.lower())
+
+
+def get_affected_models(model):
+    """
+    Returns the concrete model of the given model and its parents, whose tables are all
+    changed when an object of the model is saved or deleted (multi-table inheritance).
+    """
+    model = model._meta.concrete_model
+    return [model] + list(model._meta.get_parent_list())
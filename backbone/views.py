@@ -1,18 +1,49 @@
 from __future__ import unicode_literals
 
+from calendar import timegm
+import hashlib
+from itertools import chain, islice
 import json
 
-from django.core.serializers.json import DjangoJSONEncoder
-from django.core.serializers.python import Serializer
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.core.urlresolvers import reverse
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Manager, Model
-from django.forms.models import modelform_factory
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.db import connections, router, transaction
+from django.db.models import Count, Max, Model, Prefetch
+from django.db.models.signals import post_save, pre_save
+from django.forms.models import BaseModelForm, modelform_factory
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseNotModified,
+    StreamingHttpResponse
+)
 from django.shortcuts import get_object_or_404
+from django.utils import six
+from django.utils.encoding import force_bytes
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.six.moves import queue
 from django.utils.translation import ugettext as _
 from django.views.generic import View
 
+from backbone.cache import _model_changed, get_version, invalidate_model
+from backbone.encoders import get_json_backend
+from backbone.events import _model_saved, get_broker, get_channel, publish, track_events
+from backbone.fields import IncludedField, InvalidFields, compile_field_plan, get_field_name, select_fields
+from backbone.filters import InvalidFilter, get_filter_kwargs, get_filter_params, get_ids, get_ordering
+from backbone.pagination import CachedCountPaginator, CursorPaginator, InvalidCursor
+from backbone.sync import get_deleted_ids, get_sync_token, parse_sync_token, track_deletions
+
+try:
+    # Django versions >= 1.10
+    from django.db.models import prefetch_related_objects
+except ImportError:
+    # Django versions < 1.10
+    from django.db.models.query import prefetch_related_objects as _prefetch_related_objects
+
+    def prefetch_related_objects(model_instances, *related_lookups):
+        _prefetch_related_objects(model_instances, related_lookups)
+
 
 class BackboneAPIView(View):
     model = None  # The model to be used for this API definition
@@ -22,7 +53,30 @@ class BackboneAPIView(View):
     fields = []  # Fields to allow when adding (POST) or editing (PUT) objects.
     form = None  # The form class to be used for adding or editing objects.
     ordering = None  # Ordering used when retrieving the collection
+    include_fields = []  # Relations whose objects can be included with the ``include`` parameter (e.g. ``?include=brand``).
+    ordering_fields = []  # Fields the collection can be ordered by with the ``ordering`` parameter (e.g. ``?ordering=-price``).
+    filter_fields = {}  # Fields the collection can be filtered by, mapped to their allowed lookups (e.g. ``['exact', 'in']``).
+    display_field_hints = {}  # The ``display_field`` hints of model properties and methods, mapped by name (e.g. ``{'only': ['price']}``).
+    annotated_fields = {}  # Display fields computed by the database, mapped to their ORM expressions (e.g. ``Min('categories')``).
     paginate_by = None  # The max number of objects per page (enables use of the ``page`` GET parameter).
+    cursor_pagination = False  # Paginate using ``cursor`` tokens (seeking on ``ordering``) instead of ``page`` numbers.
+    paginate_count = True  # Set to False to skip counting the objects (pages only tell if there is a next page).
+    count_cache_timeout = None  # Cache the count of the objects for this many seconds (invalidated on changes).
+    stream_collection = False  # Stream the collection as it is serialized, instead of building it in memory.
+    stream_chunk_size = 100  # The number of objects serialized at a time when streaming the collection.
+    cache_timeout = None  # Cache get responses for this many seconds (invalidated when objects are changed).
+    cached_headers = ('Content-Type', 'Link', 'X-Total-Count')  # Response headers stored with cached responses.
+    max_batch_size = 1000  # The max number of objects that can be added, edited or deleted in a single request.
+    last_modified_field = None  # A date/time field updated on every change (e.g. ``auto_now``), used for conditional GETs.
+    delta_sync = False  # Support the ``since`` parameter for syncing the changes of the collection (needs `last_modified_field`).
+    delta_sync_margin = 60  # Sync tokens overlap by this many seconds, for the changes committed after being dated.
+    change_feed = False  # Provide an ``events`` URL streaming the changes of the collection as Server-Sent Events.
+    change_feed_keepalive = 15  # Send a comment to the change feed after this many seconds without changes.
+    read_database = None  # The database alias get requests read from, e.g. a replica (defaults to BACKBONE_READ_DATABASE).
+    read_database_sticky_timeout = 5  # Read from the default database for this many seconds after a client writes.
+    read_database_sticky_cookie = 'backbone_sticky'  # The cookie marking clients that wrote recently.
+    json_backend = None  # The JSON backend: 'json', 'simplejson' or 'orjson' (defaults to BACKBONE_JSON_BACKEND).
+    json_pretty = None  # Indent the JSON output and sort its keys (defaults to settings.DEBUG).
     url_slug = None  # The slug to be used when constructing the url (and url name) for this view.
                      # Defaults to lowercase model name. Change this if you have multiple views for the same model.
 
@@ -31,10 +85,65 @@ class BackboneAPIView(View):
         Returns the queryset (along with ordering) to be used when retrieving object(s).
         """
         qs = self.model._default_manager.all()
+        read_database = self.get_read_database(request)
+        if read_database:
+            qs = qs.using(read_database)
         if self.ordering:
             qs = qs.order_by(*self.ordering)
         return qs
 
+    def get_read_database(self, request):
+        """
+        Returns the database alias the querysets of the given request read from, or None to
+        use the database routers (i.e. the default database).
+
+        Only get requests read from `read_database`, unless the client wrote recently (see
+        `is_sticky`), the responses are cached (a lagging replica would fill the cache with stale
+        data), or a delta sync is requested (which could otherwise miss changes that are not
+        replicated yet).
+        """
+        read_database = self.read_database or getattr(settings, 'BACKBONE_READ_DATABASE', None)
+        if not read_database or request.method not in ('GET', 'HEAD'):
+            return None
+        if self.is_sticky(request) or self.cache_timeout is not None:
+            return None
+        if self.delta_sync and 'since' in request.GET:
+            return None
+        return read_database
+
+    def is_sticky(self, request):
+        """
+        Returns True if the client of the given request wrote within the last
+        `read_database_sticky_timeout` seconds (when using a `read_database`), in which case
+        it reads from the default database and not from the cache, so that it reads its own writes.
+        """
+        read_database = self.read_database or getattr(settings, 'BACKBONE_READ_DATABASE', None)
+        return bool(read_database) and self.read_database_sticky_cookie in request.COOKIES
+
+    def optimize_queryset(self, qs, fields):
+        """
+        Returns the given queryset with the relations needed to serialize the given
+        list of fields loaded in bulk (using `select_related` and `prefetch_related`), and
+        only the needed columns loaded when all the fields are columns.
+        """
+        plan = self.get_field_plan(fields)
+        qs = plan.optimize_queryset(qs)
+        if plan.only_fields is not None and not _overrides(type(self), 'serialize'):
+            # Only load the columns that are serialized
+            qs = qs.only(*plan.only_fields)
+        return qs
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super(BackboneAPIView, self).dispatch(request, *args, **kwargs)
+        read_database = self.read_database or getattr(settings, 'BACKBONE_READ_DATABASE', None)
+        if (read_database and self.read_database_sticky_timeout and response.status_code < 400 and
+                request.method not in ('GET', 'HEAD', 'OPTIONS')):
+            # The following get requests of the client read from the default database
+            response.set_cookie(
+                self.read_database_sticky_cookie, '1', max_age=self.read_database_sticky_timeout, httponly=True
+            )
+        return response
+
     def get(self, request, id=None, **kwargs):
         """
         Handles get requests for either the collection or an object detail.
@@ -42,50 +151,561 @@ class BackboneAPIView(View):
         if not self.has_get_permission(request):
             return HttpResponseForbidden(_('You do not have permission to perform this action.'))
 
+        try:
+            if id:
+                self.get_detail_fields(request)
+            else:
+                self.get_collection_fields(request)
+                self.get_filters(request)
+                self.get_requested_ordering(request)
+                self.get_requested_ids(request)
+                self.get_requested_since(request)
+        except InvalidFields as e:
+            return HttpResponseBadRequest(_('Invalid `fields` parameter: %s') % e)
+        except InvalidFilter as e:
+            return HttpResponseBadRequest(_('Invalid `%s` parameter: %s') % (e.param, e.message))
+
+        if kwargs.pop('change_feed', False):
+            return self.get_change_feed(request)
+
+        cache_key = self.get_cache_key(request, id)
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                content, headers, validators = cached
+                if self.is_not_modified(request, **validators):
+                    return self.set_validators(HttpResponseNotModified(), **validators)
+                response = HttpResponse(content)
+                for header, value in headers:
+                    response[header] = value
+                return self.set_validators(response, **validators)
+
+        validators = self.get_validators(request, id, **kwargs)
+        if validators and self.is_not_modified(request, **validators):
+            return self.set_validators(HttpResponseNotModified(), **validators)
+
         if id:
-            obj = get_object_or_404(self.queryset(request, **kwargs), id=id)
-            return self.get_object_detail(request, obj)
+            fields = self.get_detail_fields(request)
+            plan = self.get_field_plan(fields)
+            qs = plan.annotate_queryset(self.queryset(request, **kwargs))
+            if self.can_serialize_values(plan, 'get_object_detail'):
+                # Skip creating the model instance altogether
+                data = plan.serialize_values(qs.filter(id=id))
+                if not data:
+                    raise Http404(_('No %s matches the given query.') % self.model._meta.object_name)
+                response = HttpResponse(self.json_dumps(data[0]), content_type='application/json')
+            else:
+                obj = get_object_or_404(self.prefetch_included(request, qs, fields), id=id)
+                response = self.get_object_detail(request, obj)
         else:
-            return self.get_collection(request, **kwargs)
+            response = self.get_collection(request, **kwargs)
 
-    def get_object_detail(self, request, obj):
+        if response.status_code != 200:
+            return response
+        if not validators and not response.streaming:
+            # Without a `last_modified_field`, the ETag can only be computed from the content.
+            validators = {'etag': hashlib.md5(response.content).hexdigest()}
+        if cache_key is not None and not response.streaming:
+            headers = [(header, response[header]) for header in self.cached_headers if response.has_header(header)]
+            cache.set(cache_key, (response.content, headers, validators), self.cache_timeout)
+        if self.is_not_modified(request, **validators):
+            response = HttpResponseNotModified()
+        return self.set_validators(response, **validators)
+
+    def get_cache_key(self, request, id=None):
         """
-        Handles get requests for the details of the given object.
+        Returns the key used to cache the response to the given get request, or None if
+        responses are not cached (see `cache_timeout`), or not for this request (see `is_sticky`).
+
+        The key depends on the view, the URL (including its parameters), the cache scope of the
+        request (see `get_cache_scope`), and the version of the models the response depends on,
+        so that cached responses are invalidated whenever one of their objects is changed.
+        """
+        if self.cache_timeout is None or self.is_sticky(request):
+            return None
+        fields = self.get_detail_fields(request) if id else self.get_collection_fields(request)
+        key = '%s.%s:%s:%s:%s:%s' % (
+            type(self).__module__, type(self).__name__, request.path, sorted(request.GET.lists()),
+            self.get_cache_scope(request), get_version(self.get_cache_dependencies(fields))
+        )
+        return 'backbone:response:%s' % hashlib.md5(force_bytes(key)).hexdigest()
+
+    def get_cache_scope(self, request):
+        """
+        Returns the part of the cache key that separates the cached responses of different users.
+
+        By default, every user gets their own cached responses. Override this (e.g. to return
+        an empty string) if the responses don't depend on the user.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated():
+            return 'user:%s' % user.pk
+        return 'anonymous'
+
+    def get_cache_dependencies(self, fields):
+        """
+        Returns the list of models whose changes invalidate cached responses serializing the given fields.
+        """
+        return [self.model] + self.get_field_plan(fields).related_models
+
+    def get_all_cache_dependencies(self):
+        """
+        Returns the list of models whose changes can invalidate the cached responses of this
+        view, whatever fields and included relations are requested.
+        """
+        models = []
+        for display_fields in (
+            self.display_detail_fields or self.display_fields,
+            self.display_collection_fields or self.display_fields,
+        ):
+            fields = ['id'] + list(display_fields)
+            names = set(get_field_name(field) for field in fields)
+            try:
+                fields = self.get_included_fields(fields, [name for name in self.include_fields if name in names])
+            except ImproperlyConfigured:
+                # The view of a related model isn't registered yet
+                pass
+            models.extend(model for model in self.get_cache_dependencies(fields) if model not in models)
+        return models
+
+    def get_validators(self, request, id=None, **kwargs):
+        """
+        Returns the validators (``etag`` and ``last_modified``) for a get request of either
+        the collection or an object detail, or an empty dict if they can't be computed
+        without building the response.
+
+        The validators are computed from the `last_modified_field` (the latest modification
+        and the number of objects), which only needs a single aggregate query. The ETag also
+        covers the cache version of the models the fields depend on (see
+        `get_cache_dependencies`), since changes to relations (e.g. many-to-many fields or
+        included objects) don't change the `last_modified_field`.
+
+        Pages that avoid counting the collection (with `cursor_pagination`, or `paginate_count`
+        set to False) get no validators, since the aggregate query would count it anyway.
+        """
+        if not self.last_modified_field:
+            return {}
+        if not id and self.paginate_by is not None and 'ids' not in request.GET and (
+            self.cursor_pagination or not self.paginate_count
+        ) and not (self.delta_sync and 'since' in request.GET):
+            return {}
+
+        if id:
+            qs = self.queryset(request, **kwargs)
+            values = list(qs.filter(id=id).values_list(self.last_modified_field, flat=True)[:1])
+            if not values:
+                return {}
+            last_modified, count = values[0], 1
+        else:
+            qs = self.get_collection_queryset(request, **kwargs)
+            result = qs.aggregate(last_modified=Max(self.last_modified_field), count=Count('pk'))
+            last_modified, count = result['last_modified'], result['count']
+
+        fields = self.get_detail_fields(request) if id else self.get_collection_fields(request)
+        etag = hashlib.md5(force_bytes('%s.%s:%s:%s:%s:%s' % (
+            type(self).__module__, type(self).__name__, request.get_full_path(), count,
+            last_modified.isoformat() if last_modified else '', get_version(self.get_cache_dependencies(fields))
+        ))).hexdigest()
+        return {'etag': etag, 'last_modified': last_modified}
+
+    def is_not_modified(self, request, etag=None, last_modified=None):
+        """
+        Returns True if the ``If-None-Match`` or ``If-Modified-Since`` header of the request
+        matches the given validators.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            etags = [value.strip() for value in if_none_match.split(',')]
+            etags = [value[2:] if value.startswith('W/') else value for value in etags]
+            return etag is not None and ('*' in etags or '"%s"' % etag in etags)
+
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        if if_modified_since is not None and last_modified is not None:
+            return timegm(last_modified.utctimetuple()) <= if_modified_since
+        return False
+
+    def set_validators(self, response, etag=None, last_modified=None):
+        """
+        Sets the ``ETag`` and ``Last-Modified`` headers of the given response.
+        """
+        if etag is not None:
+            response['ETag'] = '"%s"' % etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(timegm(last_modified.utctimetuple()))
+        return response
+
+    def get_detail_fields(self, request):
+        """
+        Returns the list of fields to serialize for an object detail.
         """
         if self.display_detail_fields:
             display_fields = self.display_detail_fields
         else:
             display_fields = self.display_fields
+        return self.get_requested_fields(request, ['id'] + list(display_fields))
+
+    def get_collection_fields(self, request):
+        """
+        Returns the list of fields to serialize for each object of the collection.
+        """
+        if self.display_collection_fields:
+            display_fields = self.display_collection_fields
+        else:
+            display_fields = self.display_fields
+        return self.get_requested_fields(request, ['id'] + list(display_fields))
+
+    def get_requested_fields(self, request, fields):
+        """
+        Returns the given fields narrowed to the ones requested with the ``fields`` parameter
+        (a comma separated list of names), if any, and with the relations requested with the
+        ``include`` parameter included (see `get_included_fields`).
+
+        Raises `InvalidFields` if a requested field isn't one of the given fields, and
+        `InvalidFilter` if a relation can't be included.
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return fields
+        if request.GET.get('fields'):
+            fields = select_fields(fields, request.GET['fields'].split(','))
+        if request.GET.get('include'):
+            fields = self.get_included_fields(fields, request.GET['include'].split(','))
+        return fields
+
+    def get_included_fields(self, fields, names):
+        """
+        Returns the given fields with the relations of the given names (which must be listed
+        in `include_fields`) replaced by `IncludedField` instances, so that the related objects
+        are serialized (by the view registered for their model) instead of their primary keys.
+        """
+        names = set(name.strip() for name in names if name.strip())
+        available = set(get_field_name(field) for field in fields)
+        for name in names:
+            if name not in self.include_fields or name not in available:
+                raise InvalidFilter('include', _('Invalid field: %s') % name)
 
-        data = self.serialize(obj, ['id'] + list(display_fields))
+        included = []
+        for field in fields:
+            if get_field_name(field) in names:
+                related_model = self.model._meta.get_field(field).related_model
+                view = self.get_included_view_class(field, related_model)()
+                if view.display_collection_fields:
+                    display_fields = view.display_collection_fields
+                else:
+                    display_fields = view.display_fields
+                field = IncludedField(field, view, ['id'] + list(display_fields))
+            included.append(field)
+        return included
+
+    def get_included_view_class(self, name, model):
+        """
+        Returns the view class used to serialize the related objects of the given relation
+        when it is included, i.e. the first view class registered for the related model.
+        """
+        from backbone import site  # This is to prevent a circular import issue
+
+        view_class = site.get_view_class(model)
+        if view_class is None:
+            raise ImproperlyConfigured('No backbone view is registered for the included field: %s' % name)
+        return view_class
+
+    def prefetch_included(self, request, qs, fields):
+        """
+        Returns the given queryset with the objects of the included relations among the given
+        fields prefetched (with a single query per relation), from the `queryset` of their view.
+        """
+        prefetches = [
+            Prefetch(field.name, queryset=field.view.optimize_queryset(field.view.queryset(request), field.fields))
+            for field in fields if isinstance(field, IncludedField)
+        ]
+        if prefetches:
+            qs = qs.prefetch_related(*prefetches)
+        return qs
+
+    def get_object_detail(self, request, obj):
+        """
+        Handles get requests for the details of the given object.
+        """
+        fields = self.get_detail_fields(request)
+        self.annotate_objects([obj], fields)
+        data = self.serialize(obj, fields)
         return HttpResponse(self.json_dumps(data), content_type='application/json')
 
     def get_collection(self, request, **kwargs):
         """
         Handles get requests for the list of objects.
         """
-        qs = self.queryset(request, **kwargs)
+        fields = self.get_collection_fields(request)
+        qs = self.optimize_queryset(self.get_collection_queryset(request, **kwargs), fields)
+        qs = self.prefetch_included(request, qs, fields)
 
-        if self.display_collection_fields:
-            display_fields = self.display_collection_fields
-        else:
-            display_fields = self.display_fields
+        if self.delta_sync and 'since' in request.GET:
+            return self.get_collection_changes(request, qs, fields)
 
-        if self.paginate_by is not None:
-            page = request.GET.get('page', 1)
-            paginator = Paginator(qs, self.paginate_by)
-            try:
-                qs = paginator.page(page).object_list
-            except PageNotAnInteger:
-                data = _('Invalid `page` parameter: Not a valid integer.')
-                return HttpResponseBadRequest(data)
-            except EmptyPage:
+        # Requested ids are not paginated (their number is limited by `max_batch_size` already)
+        if self.paginate_by is not None and 'ids' not in request.GET:
+            if self.cursor_pagination:
+                return self.get_collection_page_by_cursor(request, qs, fields)
+            return self.get_collection_page(request, qs, fields)
+
+        if self.stream_collection:
+            return StreamingHttpResponse(
+                self.stream_queryset(qs, fields), content_type='application/json'
+            )
+        data = self.serialize_queryset(qs, fields)
+        return HttpResponse(self.json_dumps(data), content_type='application/json')
+
+    def get_collection_queryset(self, request, **kwargs):
+        """
+        Returns the queryset of the objects of the collection, i.e. the `queryset` narrowed
+        by the filters and ids of the request (see `get_filters` and `get_requested_ids`), in
+        the requested ordering (if any).
+        """
+        qs = self.queryset(request, **kwargs).filter(**self.get_filters(request))
+        ids = self.get_requested_ids(request)
+        if ids is not None:
+            qs = qs.filter(pk__in=ids)
+        ordering = self.get_requested_ordering(request)
+        if ordering:
+            qs = qs.order_by(*ordering)
+        return qs
+
+    def get_filters(self, request):
+        """
+        Returns the `QuerySet.filter()` keyword arguments for the filter parameters of the
+        request (see `filter_fields`), e.g. ``?brand=1`` or ``?price__gte=10``.
+
+        Raises `InvalidFilter` if a parameter has an invalid value.
+        """
+        if not self.filter_fields:
+            return {}
+        return get_filter_kwargs(get_filter_params(self.model, self.filter_fields), request.GET)
+
+    def get_requested_ordering(self, request):
+        """
+        Returns the ordering requested with the ``ordering`` parameter (see `ordering_fields`),
+        or None if no ordering was requested.
+
+        Raises `InvalidFilter` if the ordering isn't allowed (including by fields that cursor
+        pagination can't seek on, when using `cursor_pagination`).
+        """
+        if not request.GET.get('ordering'):
+            return None
+        cursor = self.cursor_pagination and self.paginate_by is not None
+        return get_ordering(request.GET['ordering'], self.ordering_fields, self.model, cursor=cursor)
+
+    def get_requested_ids(self, request):
+        """
+        Returns the list of ids requested with the ``ids`` parameter (e.g. ``?ids=1,2,3``), or
+        None if no ids were requested. At most `max_batch_size` ids can be requested.
+
+        Raises `InvalidFilter` if an id is invalid or there are too many ids.
+        """
+        if 'ids' not in request.GET:
+            return None
+        return get_ids(request.GET['ids'], self.model, self.max_batch_size)
+
+    def get_requested_since(self, request):
+        """
+        Returns the date and time of the sync token given with the ``since`` parameter (when
+        using `delta_sync`), or None if no token is given.
+
+        Raises `InvalidFilter` if the token is invalid.
+        """
+        if not self.delta_sync or not request.GET.get('since'):
+            return None
+        return parse_sync_token(request.GET['since'])
+
+    def get_collection_changes(self, request, qs, fields):
+        """
+        Handles get requests for the changes of the collection since the sync token given with
+        the ``since`` parameter (or for all of the collection, if the parameter is empty).
+
+        Returns the changed objects, the ids of the deleted ones (including the objects changed
+        out of the collection, e.g. by no longer matching the `queryset`), and the token for the
+        next sync.
+        """
+        if not self.last_modified_field:
+            raise ImproperlyConfigured('Delta syncs require a `last_modified_field`.')
+        # Deletions are usually tracked from the registration of the view already
+        track_deletions(self.model)
+
+        # The token is taken before reading the changes (and back-dated by `delta_sync_margin`,
+        # for the changes that are committed after being dated), so that none are missed.
+        token = get_sync_token(self.delta_sync_margin)
+        since = self.get_requested_since(request)
+        deleted = []
+        if since is not None:
+            changed = {'%s__gte' % self.last_modified_field: since}
+            qs = qs.filter(**changed)
+            deleted = get_deleted_ids(self.model, since)
+            deleted.extend(
+                self.model._default_manager.db_manager(qs.db).filter(**changed).exclude(
+                    pk__in=self.get_collection_queryset(request).values('pk')
+                ).values_list('pk', flat=True)
+            )
+
+        data = {'changed': self.serialize_queryset(qs, fields), 'deleted': deleted, 'since': token}
+        return HttpResponse(self.json_dumps(data), content_type='application/json')
+
+    def get_change_feed(self, request):
+        """
+        Handles get requests for the change feed of the collection (see `change_feed`).
+
+        The changes (``created``, ``updated`` and ``deleted`` events) are streamed as
+        Server-Sent Events, with the objects serialized with the collection fields.
+        """
+        fields = self.get_collection_fields(request)
+        response = StreamingHttpResponse(self.stream_changes(request, fields), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    def stream_changes(self, request, fields):
+        """
+        Generates the Server-Sent Events for the changes of the collection, as they happen.
+        """
+        track_events(self.model)
+        broker = get_broker()
+        channel = get_channel(self.model)
+        subscriber = broker.subscribe(channel)
+        try:
+            yield ': connected\n\n'
+            while True:
+                try:
+                    message = subscriber.get(timeout=self.change_feed_keepalive)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                event, data = self.get_change_event(request, fields, message)
+                if event is not None:
+                    # Each line of the data would need its own prefix, so it is never indented
+                    yield 'event: %s\ndata: %s\n\n' % (event, self.json_dumps(data, indent=None))
+        finally:
+            broker.unsubscribe(channel, subscriber)
+
+    def get_change_event(self, request, fields, message):
+        """
+        Returns the event and data sent to the change feed for the given published change,
+        or (None, None) if nothing is sent.
+
+        Only the objects in the `queryset` are sent; objects that are updated out of it are sent
+        as deleted.
+        """
+        pk = message['pk']
+        if message['event'] == 'deleted':
+            return 'deleted', {'id': pk}
+
+        # The change was just committed, so it may not be replicated to the `read_database` yet
+        qs = self.queryset(request).using(router.db_for_write(self.model))
+        qs = self.prefetch_included(request, self.optimize_queryset(qs, fields), fields)
+        objs = list(qs.filter(pk=pk))
+        if not objs:
+            if message['event'] == 'updated':
+                return 'deleted', {'id': pk}
+            return None, None
+        return message['event'], self.serialize(objs[0], fields)
+
+    def get_collection_page(self, request, qs, fields):
+        """
+        Handles get requests for a page of the collection (given by the ``page`` parameter).
+
+        The URL of the next page (if any) is returned in the ``Link`` header and, unless
+        `paginate_count` is False, the total number of objects in the ``X-Total-Count`` header.
+        """
+        number = request.GET.get('page', 1)
+        try:
+            if self.paginate_count:
+                paginator = self.get_paginator(qs)
+                page = paginator.page(number)
+                number, count, qs = page.number, paginator.count, page.object_list
+            else:
+                try:
+                    number = int(number)
+                except (TypeError, ValueError):
+                    raise PageNotAnInteger
+                if number < 1:
+                    raise EmptyPage
+                count = None
+                # Fetch one extra object to tell whether there is a next page, instead of counting
+                bottom = (number - 1) * self.paginate_by
+                qs = qs[bottom:bottom + self.paginate_by + 1]
+        except PageNotAnInteger:
+            data = _('Invalid `page` parameter: Not a valid integer.')
+            return HttpResponseBadRequest(data)
+        except EmptyPage:
+            data = _('Invalid `page` parameter: Out of range.')
+            return HttpResponseBadRequest(data)
+
+        if count is None:
+            data = self.serialize_queryset(qs, fields)
+            if not data and number > 1:
                 data = _('Invalid `page` parameter: Out of range.')
                 return HttpResponseBadRequest(data)
-        data = [
-            self.serialize(obj, ['id'] + list(display_fields)) for obj in qs
-        ]
-        return HttpResponse(self.json_dumps(data), content_type='application/json')
+            has_next = len(data) > self.paginate_by
+            response = HttpResponse(self.json_dumps(data[:self.paginate_by]), content_type='application/json')
+        else:
+            has_next = number * self.paginate_by < count
+            if self.stream_collection:
+                response = StreamingHttpResponse(
+                    self.stream_queryset(qs, fields), content_type='application/json'
+                )
+            else:
+                data = self.serialize_queryset(qs, fields)
+                response = HttpResponse(self.json_dumps(data), content_type='application/json')
+            response['X-Total-Count'] = count
+
+        if has_next:
+            self.set_next_page_link(request, response, 'page', number + 1)
+        return response
+
+    def get_paginator(self, qs):
+        """
+        Returns the paginator used to split the collection into pages (when `paginate_count` is True).
+        """
+        if self.count_cache_timeout is not None:
+            return CachedCountPaginator(qs, self.paginate_by, self.count_cache_timeout)
+        return Paginator(qs, self.paginate_by)
+
+    def set_next_page_link(self, request, response, param, value):
+        """
+        Sets the ``Link`` header of the given response to the URL of the next page, i.e. the current
+        URL with the given parameter changed to the given value.
+        """
+        params = request.GET.copy()
+        params[param] = value
+        response['Link'] = '<%s>; rel="next"' % request.build_absolute_uri('?' + params.urlencode())
+
+    def get_collection_page_by_cursor(self, request, qs, fields):
+        """
+        Handles get requests for a page of the collection when using cursor pagination.
+
+        The URL of the next page (if any) is returned in the ``Link`` header.
+        """
+        paginator = CursorPaginator(qs, self.paginate_by, self.get_requested_ordering(request) or self.ordering)
+        plan = self.get_field_plan(fields)
+        values = self.can_serialize_values(plan)
+        try:
+            page = paginator.page(request.GET.get('cursor'))
+            if values:
+                # The ordering fields are needed for the next cursor
+                items = list(plan.values_queryset(page, extra=paginator.field_names))
+            else:
+                items = list(page)
+        except InvalidCursor:
+            return HttpResponseBadRequest(_('Invalid `cursor` parameter.'))
+
+        next_cursor = paginator.get_next_cursor(items)
+        items = items[:self.paginate_by]
+        if values:
+            data = [
+                plan.convert_values(dict((key, row[key]) for key in plan.values_fields)) for row in items
+            ]
+        else:
+            data = [self.serialize(obj, fields) for obj in items]
+
+        response = HttpResponse(self.json_dumps(data), content_type='application/json')
+        if next_cursor:
+            self.set_next_page_link(request, response, 'cursor', next_cursor)
+        return response
 
     def post(self, request, id=None, **kwargs):
         """
@@ -105,12 +725,13 @@ class BackboneAPIView(View):
         Adds an object.
         """
         try:
-            # backbone sends data in the body in json format
-            # Conditional statement is for backwards compatibility with Django <= 1.3
-            data = json.loads(request.body if hasattr(request, 'body') else request.raw_post_data)
+            data = self.get_json_data(request)
         except ValueError:
             return HttpResponseBadRequest(_('Unable to parse JSON request body.'))
 
+        if isinstance(data, list):
+            return self.add_objects(request, data)
+
         form = self.get_form_instance(request, data=data)
         if form.is_valid():
             if not self.has_add_permission_for_data(request, form.cleaned_data):
@@ -132,6 +753,98 @@ class BackboneAPIView(View):
         else:
             return HttpResponseBadRequest(self.json_dumps(form.errors), content_type='application/json')
 
+    def add_objects(self, request, data):
+        """
+        Adds a list of objects in a single transaction.
+
+        Either all the objects are added, or none of them are (in which case the errors are
+        returned as a list, with an empty dict for each valid item).
+        """
+        if len(data) > self.max_batch_size:
+            return HttpResponseBadRequest(
+                _('Too many objects (the maximum is %d).') % self.max_batch_size
+            )
+
+        forms = [
+            self.get_form_instance(request, data=item) if isinstance(item, dict) else None
+            for item in data
+        ]
+        errors = [
+            form.errors if form is not None else {'__all__': [_('Expected a JSON object.')]}
+            for form in forms
+        ]
+        if any(errors):
+            return HttpResponseBadRequest(self.json_dumps(errors), content_type='application/json')
+
+        for form in forms:
+            if not self.has_add_permission_for_data(request, form.cleaned_data):
+                return HttpResponseForbidden(_('You do not have permission to perform this action.'))
+
+        using = router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            if self.can_bulk_create(forms):
+                objs = [form.save(commit=False) for form in forms]
+                self.model._default_manager.bulk_create(objs)
+                # bulk_create() doesn't send the post_save signal
+                invalidate_model(self.model, using)
+                for obj in objs:
+                    publish(self.model, 'created', obj.pk)
+            else:
+                objs = [form.save() for form in forms]
+
+        # We return the details of the newly created objects
+        return self.get_objects_detail(request, objs, status=201)
+
+    def can_bulk_create(self, forms):
+        """
+        Returns True if the objects of the given (valid) forms can be inserted with a single
+        `bulk_create()` query, without changing the semantics of saving them one by one.
+
+        This requires a database that returns the ids of the inserted objects, and no custom
+        `save()` methods, many-to-many fields, multi-table inheritance or receivers of the
+        `pre_save` and `post_save` signals of the model (which `bulk_create()` doesn't send),
+        other than backbone's own.
+        """
+        opts = self.model._meta
+        features = connections[router.db_for_write(self.model)].features
+        if not getattr(features, 'can_return_ids_from_bulk_insert', False):
+            return False
+        if opts.parents or _overrides(self.model, 'save', Model) or _has_save_receivers(self.model):
+            return False
+        for form in forms:
+            if _overrides(type(form), 'save', BaseModelForm):
+                return False
+            if any(field.name in form.fields for field in opts.many_to_many):
+                return False
+        return True
+
+    def get_objects_detail(self, request, objs, status=200):
+        """
+        Returns the response with the details of the given list of objects.
+        """
+        fields = self.get_detail_fields(request)
+        plan = self.get_field_plan(fields)
+        if plan.prefetch_related:
+            prefetch_related_objects(objs, *plan.prefetch_related)
+        self.annotate_objects(objs, fields)
+        data = [self.serialize(obj, fields) for obj in objs]
+        return HttpResponse(self.json_dumps(data), content_type='application/json', status=status)
+
+    def annotate_objects(self, objs, fields):
+        """
+        Sets the values of the `annotated_fields` among the given fields on the given objects
+        which weren't loaded with them (e.g. objects that were just saved), with a single query.
+        """
+        annotations = self.get_field_plan(fields).annotations
+        objs = [obj for obj in objs if not all(hasattr(obj, name) for name in annotations)]
+        if not objs:
+            return
+        qs = self.model._default_manager.db_manager(objs[0]._state.db).filter(pk__in=[obj.pk for obj in objs])
+        values = dict((row['pk'], row) for row in qs.annotate(**annotations).values('pk', *annotations))
+        for obj in objs:
+            for name in annotations:
+                setattr(obj, name, values[obj.pk][name])
+
     def put(self, request, id=None, **kwargs):
         """
         Handles put requests.
@@ -143,17 +856,21 @@ class BackboneAPIView(View):
             else:
                 return self.update_object(request, obj)
         else:
-            # No putting on a collection.
-            return HttpResponseForbidden()
+            try:
+                data = self.get_batch_data(request)
+            except ValueError:
+                return HttpResponseBadRequest(_('Unable to parse JSON request body.'))
+            if data is None:
+                # No putting on a collection (other than a list of changes).
+                return HttpResponseForbidden()
+            return self.update_objects(request, data)
 
     def update_object(self, request, obj):
         """
         Updates an object.
         """
         try:
-            # backbone sends data in the body in json format
-                # Conditional statement is for backwards compatibility with Django <= 1.3
-            data = json.loads(request.body if hasattr(request, 'body') else request.raw_post_data)
+            data = self.get_json_data(request)
         except ValueError:
             return HttpResponseBadRequest(_('Unable to parse JSON request body.'))
 
@@ -168,6 +885,65 @@ class BackboneAPIView(View):
         else:
             return HttpResponseBadRequest(self.json_dumps(form.errors), content_type='application/json')
 
+    def patch(self, request, id=None, **kwargs):
+        """
+        Handles patch requests.
+        """
+        if id:
+            obj = get_object_or_404(self.queryset(request), id=id)
+            if not self.has_update_permission(request, obj):
+                return HttpResponseForbidden(_('You do not have permission to perform this action.'))
+            else:
+                return self.partial_update_object(request, obj)
+        else:
+            # No patching on a collection.
+            return HttpResponseForbidden()
+
+    def partial_update_object(self, request, obj):
+        """
+        Updates only the fields of an object that are sent (e.g. with Backbone's `{patch: true}`).
+
+        Only the sent fields are validated, and only their columns (and those of ``auto_now``
+        fields) are written.
+        """
+        try:
+            data = self.get_json_data(request)
+        except ValueError:
+            return HttpResponseBadRequest(_('Unable to parse JSON request body.'))
+        if not isinstance(data, dict):
+            return HttpResponseBadRequest(_('Expected a JSON object.'))
+
+        form = self.get_form_instance(request, data=data, instance=obj)
+        unchanged = [name for name in form.fields if name not in data]
+        for name in unchanged:
+            del form.fields[name]
+
+        if form.is_valid():
+            # The permission hook gets the current values of the fields that weren't sent, of the
+            # same types as cleaned values (e.g. related objects and querysets)
+            opts = self.model._meta
+            cleaned_data = dict(
+                (field.name, getattr(obj, field.name).all() if field.many_to_many else getattr(obj, field.name))
+                for field in chain(opts.concrete_fields, opts.many_to_many) if field.name in unchanged
+            )
+            cleaned_data.update(form.cleaned_data)
+            if not self.has_update_permission_for_data(request, cleaned_data):
+                return HttpResponseForbidden(_('You do not have permission to perform this action.'))
+
+            obj = form.save(commit=False)
+            update_fields = [
+                field.name for field in opts.concrete_fields
+                if field.name in form.cleaned_data or getattr(field, 'auto_now', False)
+            ]
+            if update_fields:
+                obj.save(update_fields=update_fields)
+            form.save_m2m()
+
+            # We return the updated object details
+            return self.get_object_detail(request, obj)
+        else:
+            return HttpResponseBadRequest(self.json_dumps(form.errors), content_type='application/json')
+
     def get_form_instance(self, request, data=None, instance=None):
         """
         Returns an instantiated form to be used for adding or editing an object.
@@ -175,12 +951,29 @@ class BackboneAPIView(View):
         The `instance` argument is the model instance (passed only if this form
         is going to be used for editing an existing object).
         """
-        defaults = {}
-        if self.form:
-            defaults['form'] = self.form
-        if self.fields:
-            defaults['fields'] = self.fields
-        return modelform_factory(self.model, **defaults)(data=data, instance=instance)
+        return self.get_form_class(request)(data=data, instance=instance)
+
+    def get_form_class(self, request):
+        """
+        Returns the model form class to be used for adding or editing an object.
+
+        The class is built once per view class (and `form`/`fields`), and then reused.
+        """
+        forms = type(self).__dict__.get('_form_classes')
+        if forms is None:
+            forms = {}
+            setattr(type(self), '_form_classes', forms)
+
+        key = (self.form, tuple(self.fields) if self.fields else None)
+        form_class = forms.get(key)
+        if form_class is None:
+            defaults = {}
+            if self.form:
+                defaults['form'] = self.form
+            if self.fields:
+                defaults['fields'] = self.fields
+            form_class = forms[key] = modelform_factory(self.model, **defaults)
+        return form_class
 
     def delete(self, request, id=None):
         """
@@ -193,8 +986,14 @@ class BackboneAPIView(View):
             else:
                 return self.delete_object(request, obj)
         else:
-            # No delete requests allowed on collection view
-            return HttpResponseForbidden()
+            try:
+                data = self.get_batch_data(request)
+            except ValueError:
+                return HttpResponseBadRequest(_('Unable to parse JSON request body.'))
+            if data is None:
+                # No delete requests allowed on collection view (other than for a list of ids)
+                return HttpResponseForbidden()
+            return self.delete_objects(request, data)
 
     def delete_object(self, request, obj):
         """
@@ -203,6 +1002,117 @@ class BackboneAPIView(View):
         obj.delete()
         return HttpResponse(status=204)
 
+    def get_json_data(self, request):
+        """
+        Returns the data sent in the JSON request body (which is how backbone sends data).
+
+        Raises `ValueError` if the body can't be parsed.
+        """
+        # Conditional statement is for backwards compatibility with Django <= 1.3
+        return json.loads(request.body if hasattr(request, 'body') else request.raw_post_data)
+
+    def get_batch_data(self, request):
+        """
+        Returns the list sent in the JSON request body, or None if the body is empty or isn't a list.
+
+        Raises `ValueError` if the body can't be parsed.
+        """
+        if not request.body.strip():
+            return None
+        data = self.get_json_data(request)
+        return data if isinstance(data, list) else None
+
+    def get_batch_objects(self, request, ids):
+        """
+        Returns the objects with the given ids (in the same order), fetched with a single query.
+
+        Raises ValidationError if an id is invalid, and Http404 if any of the objects doesn't
+        exist (or isn't in the `queryset`).
+        """
+        pk = self.model._meta.pk
+
+        def parse(id):
+            # Ids are JSON strings or integers (not e.g. objects or lists)
+            if isinstance(id, six.string_types + six.integer_types) and not isinstance(id, bool):
+                try:
+                    return pk.to_python(id)
+                except ValidationError:
+                    pass
+            raise ValidationError(_('Invalid id: %s') % json.dumps(id))
+
+        ids = [parse(id) for id in ids]
+        objs = self.queryset(request).in_bulk(ids)
+        if len(objs) != len(set(ids)):
+            raise Http404
+        return [objs[id] for id in ids]
+
+    def update_objects(self, request, data):
+        """
+        Updates a list of objects (each item containing the `id` of the object to update)
+        in a single transaction.
+
+        Either all the objects are updated, or none of them are (in which case the errors are
+        returned as a list, with an empty dict for each valid item).
+        """
+        if len(data) > self.max_batch_size:
+            return HttpResponseBadRequest(
+                _('Too many objects (the maximum is %d).') % self.max_batch_size
+            )
+        if not all(isinstance(item, dict) and 'id' in item for item in data):
+            return HttpResponseBadRequest(_('Expected a list of JSON objects with an id.'))
+
+        try:
+            objs = self.get_batch_objects(request, [item['id'] for item in data])
+        except ValidationError as e:
+            return HttpResponseBadRequest(' '.join(e.messages))
+        for obj in objs:
+            if not self.has_update_permission(request, obj):
+                return HttpResponseForbidden(_('You do not have permission to perform this action.'))
+
+        forms = [
+            self.get_form_instance(request, data=item, instance=obj) for item, obj in zip(data, objs)
+        ]
+        errors = [form.errors for form in forms]
+        if any(errors):
+            return HttpResponseBadRequest(self.json_dumps(errors), content_type='application/json')
+
+        for form in forms:
+            if not self.has_update_permission_for_data(request, form.cleaned_data):
+                return HttpResponseForbidden(_('You do not have permission to perform this action.'))
+
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            for form in forms:
+                form.save()
+
+        # We return the updated objects details
+        return self.get_objects_detail(request, objs)
+
+    def delete_objects(self, request, ids):
+        """
+        Deletes the objects with the given list of ids in a single transaction.
+        """
+        if len(ids) > self.max_batch_size:
+            return HttpResponseBadRequest(
+                _('Too many objects (the maximum is %d).') % self.max_batch_size
+            )
+
+        try:
+            objs = self.get_batch_objects(request, ids)
+        except ValidationError as e:
+            return HttpResponseBadRequest(' '.join(e.messages))
+        for obj in objs:
+            if not self.has_delete_permission(request, obj):
+                return HttpResponseForbidden(_('You do not have permission to perform this action.'))
+
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            if _overrides(type(self), 'delete_object') or _overrides(self.model, 'delete', Model):
+                for obj in objs:
+                    self.delete_object(request, obj)
+            else:
+                # Neither deleting is customized, so a single queryset delete() does the same
+                self.model._default_manager.filter(pk__in=[obj.pk for obj in objs]).delete()
+        return HttpResponse(status=204)
+
     def has_get_permission(self, request):
         """
         Returns True if the requesting user is allowed to retrieve objects.
@@ -260,48 +1170,113 @@ class BackboneAPIView(View):
         """
         Serializes a single model instance to a Python dict, based on the specified list of fields.
         """
+        return self.get_field_plan(fields).serialize(self, obj)
 
-        data = {}
-        remaining_fields = []
-        for field in fields:
-            if callable(field):  # Callable
-                data[field.__name__] = field(obj)
-            elif hasattr(self, field) and callable(getattr(self, field)):  # Method on the view
-                data[field] = getattr(self, field)(obj)
-            elif hasattr(obj, field):  # Callable/property/field on the model
-                attr = getattr(obj, field)
-                if isinstance(attr, Model):
-                    data[field] = attr.pk
-                elif isinstance(attr, Manager):
-                    data[field] = [item['pk'] for item in attr.values('pk')]
-                elif callable(attr):  # Callable on the model
-                    data[field] = attr()
-                else:
-                    remaining_fields.append(field)
-            else:
-                raise AttributeError('Invalid field: %s' % field)
+    def serialize_queryset(self, qs, fields):
+        """
+        Serializes all the objects of the given queryset to a list of Python dicts.
 
-        # Add on db fields
-        serializer = Serializer()
-        serializer.serialize([obj], fields=list(remaining_fields))
-        data.update(serializer.getvalue()[0]['fields'])
+        When all of the fields are plain columns, rows are read with `QuerySet.values()`
+        instead of creating model instances.
+        """
+        plan = self.get_field_plan(fields)
+        if self.can_serialize_values(plan):
+            return plan.serialize_values(qs)
+        return [self.serialize(obj, fields) for obj in qs]
 
-        # Any remaining fields should be properties on the model
-        remaining_fields = set(remaining_fields) - set(data.keys())
+    def stream_queryset(self, qs, fields):
+        """
+        Generates the JSON array of the serialized objects of the given queryset piece by piece.
+
+        Objects are read with `QuerySet.iterator()` and serialized `stream_chunk_size` at a time
+        (prefetching related objects per chunk), so memory use does not grow with the collection.
+        """
+        plan = self.get_field_plan(fields)
+        values = self.can_serialize_values(plan)
+        if values:
+            rows = plan.values_queryset(qs).iterator()
+        else:
+            # `iterator()` ignores `prefetch_related`, so it is done per chunk instead.
+            rows = qs.iterator()
+            lookups = qs._prefetch_related_lookups
+
+        def serialize_chunk(chunk):
+            if values:
+                return [plan.convert_values(row) for row in chunk]
+            if lookups:
+                prefetch_related_objects(chunk, *lookups)
+            return [self.serialize(obj, fields) for obj in chunk]
+
+        yield '['
+        separator = ''
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                break
+            # Strip the brackets from the encoded chunk to splice it into the array.
+            yield separator + self.json_dumps(serialize_chunk(chunk))[1:-1]
+            separator = ','
+        yield ']'
+
+    def can_serialize_values(self, plan, *methods):
+        """
+        Returns True if objects can be serialized with the given plan directly from
+        `QuerySet.values()` rows.
+
+        This is only the case when all the fields of the plan are columns and neither `serialize`
+        nor any of the other given methods has been overridden on this view.
+        """
+        if plan.values_fields is None:
+            return False
+        return not any(_overrides(type(self), name) for name in ('serialize',) + methods)
 
-        for field in remaining_fields:
-            data[field] = getattr(obj, field)
+    def get_field_plan(self, fields):
+        """
+        Returns the compiled `FieldPlan` used to serialize objects for the given list of fields.
 
-        return data
+        Plans are compiled once per view class and list of fields, and then reused for every object.
+        """
+        plans = type(self).__dict__.get('_field_plans')
+        if plans is None:
+            plans = {}
+            setattr(type(self), '_field_plans', plans)
+
+        key = tuple(fields)
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = compile_field_plan(type(self), self.model, fields)
+        return plan
 
     def json_dumps(self, data, **options):
         """
-        Wrapper around `json.dumps` that uses a special JSON encoder.
+        Encodes the given data to JSON with the view's JSON backend (see `backbone.encoders`).
+
+        The output is compact, unless `json_pretty` is True (which defaults to `settings.DEBUG`),
+        in which case it is indented and keys are sorted.
         """
-        params = {'sort_keys': True, 'indent': 2}
+        pretty = settings.DEBUG if self.json_pretty is None else self.json_pretty
+        params = {'sort_keys': True, 'indent': 2} if pretty else {}
         params.update(options)
-        # This code is based off django's built in JSON serializer
-        if json.__version__.split('.') >= ['2', '1', '3']:
-            # Use JS strings to represent Python Decimal instances (ticket #16850)
-            params.update({'use_decimal': False})
-        return json.dumps(data, cls=DjangoJSONEncoder, **params)
+        backend = get_json_backend(self.json_backend or getattr(settings, 'BACKBONE_JSON_BACKEND', None))
+        return backend.dumps(data, **params)
+
+
+def _overrides(cls, name, base=None):
+    """
+    Returns True if the given method of the base class (`BackboneAPIView` by default)
+    is overridden by the class.
+    """
+    method = getattr(cls, name)
+    default = getattr(base or BackboneAPIView, name)
+    return getattr(method, '__func__', method) is not getattr(default, '__func__', default)
+
+
+def _has_save_receivers(model):
+    """
+    Returns True if receivers are connected to the `pre_save` or `post_save` signals of the
+    given model, other than backbone's own (whose work `add_objects` does after `bulk_create()`).
+    """
+    for signal in (pre_save, post_save):
+        if any(receiver not in (_model_changed, _model_saved) for receiver in signal._live_receivers(model)):
+            return True
+    return False
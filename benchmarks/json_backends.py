@@ -0,0 +1,60 @@
+"""
+Compares the JSON backends available to ``BackboneAPIView.json_dumps`` on a typical
+collection payload (backends that are not installed are skipped).
+
+Usage::
+
+    python benchmarks/json_backends.py [number of objects]
+"""
+from __future__ import print_function, unicode_literals
+
+import datetime
+from decimal import Decimal
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from django.conf import settings
+
+settings.configure()
+
+from backbone.encoders import BACKENDS, JSONBackend
+
+
+def get_payload(size):
+    now = datetime.datetime(2016, 10, 25, 14, 30, 59, 123456)
+    return [{
+        'id': i,
+        'name': 'Product %s' % i,
+        'brand': i % 10,
+        'categories': [1, 2, 3],
+        'price': Decimal('12.34'),
+        'order': i,
+        'creation_date': now,
+        'sale_date': None,
+        'is_priced_under_10': False,
+        'uuid': uuid.UUID(int=i),
+    } for i in range(size)]
+
+
+def main(size=5000, repeat=5):
+    data = get_payload(size)
+    reference = JSONBackend().dumps(data)
+    print('Encoding %s objects (best of %s):' % (size, repeat))
+    for name, backend_class in sorted(BACKENDS.items()):
+        try:
+            backend = backend_class()
+        except ImportError:
+            print('  %-12s not installed' % name)
+            continue
+        assert backend.dumps(data) == reference, 'Output of %s differs from json' % name
+        for label, options in (('compact', {}), ('pretty', {'sort_keys': True, 'indent': 2})):
+            seconds = min(timeit.repeat(lambda: backend.dumps(data, **options), number=1, repeat=repeat))
+            print('  %-12s %-8s %8.2f ms' % (name, label, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
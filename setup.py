@@ -5,7 +5,10 @@ import backbone
 
 setup(
     name='django-backbone',
-    packages=['backbone', 'backbone.tests'],
+    packages=[
+        'backbone', 'backbone.management', 'backbone.management.commands', 'backbone.migrations',
+        'backbone.tests'
+    ],
     version=backbone.__version__,
     description=backbone.__doc__,
     long_description=open('README.rst').read(),